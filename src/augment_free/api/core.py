@@ -18,6 +18,7 @@ from .handlers import (
     clean_workspace_storage,
     clean_global_storage,
     clean_storage_comprehensive,
+    failure_count,
     modify_jetbrains_ids,
     get_jetbrains_config_dir,
     get_jetbrains_info,
@@ -490,10 +491,14 @@ class AugmentFreeAPI:
                     success_msg += f"\n   • Files processed: {result.get('deleted_files_count', 0)}"
                     success_msg += f"\n   • Deletion method: {result.get('deletion_method', 'unknown')}"
                     success_msg += f"\n   • Workspace still exists: {'Yes' if result.get('workspace_still_exists') else 'No'}"
-                    if result.get('failed_operations'):
-                        success_msg += f"\n   • Failed operations: {len(result['failed_operations'])}"
+                    failed_count = failure_count(result.get('failed_operations'))
+                    if failed_count:
+                        success_msg += f"\n   • Failed operations: {failed_count}"
                     if result.get('backup_path'):
                         success_msg += f"\n   • Backup created: {result['backup_path']}"
+                    if result.get('pending_reboot'):
+                        success_msg += (f"\n   • Pending restart: {len(result.get('pending_reboot_paths', []))} "
+                                        f"locked item(s) will be deleted after the next restart")
 
                     workspace_success = result.get('success', True) and not result.get('workspace_still_exists', True)
 
@@ -592,12 +597,15 @@ class AugmentFreeAPI:
 
                     # Determine success
                     global_success = result.get('success', True)
-                    if not global_success and len(result.get('failed_operations', [])) > 0:
+                    if not global_success and failure_count(result.get('failed_operations')) > 0:
                         global_success = False
 
                     success_msg = f"GlobalStorage cleaned: {result.get('deleted_files_count', 0)} files deleted"
                     if result.get('backup_path'):
                         success_msg += f", backup created at {result['backup_path']}"
+                    if result.get('pending_reboot'):
+                        success_msg += (f"; {len(result.get('pending_reboot_paths', []))} locked item(s) "
+                                        f"will be deleted after the next restart")
 
                     results["results"][ide_name] = {
                         "success": global_success,
@@ -628,7 +636,8 @@ class AugmentFreeAPI:
                 "message": "Failed to clean globalStorage"
             }
 
-    def clean_storage_comprehensive(self, clean_global: bool = True, clean_workspace: bool = True) -> Dict[str, Any]:
+    def clean_storage_comprehensive(self, clean_global: bool = True, clean_workspace: bool = True,
+                                    create_backup: bool = True) -> Dict[str, Any]:
         """
         Comprehensive storage cleaning for all detected VSCode-based IDEs.
         Can clean globalStorage, workspaceStorage, or both.
@@ -636,6 +645,7 @@ class AugmentFreeAPI:
         Args:
             clean_global (bool): Whether to clean globalStorage directories
             clean_workspace (bool): Whether to clean workspaceStorage directories
+            create_backup (bool): Whether to zip each directory before deleting it
 
         Returns:
             dict: Operation results for all IDEs
@@ -689,7 +699,8 @@ class AugmentFreeAPI:
                         clean_global=clean_global,
                         clean_workspace=clean_workspace,
                         global_storage_path=global_storage_path,
-                        workspace_storage_path=workspace_storage_path
+                        workspace_storage_path=workspace_storage_path,
+                        create_backup=create_backup
                     )
 
                     # Determine success
@@ -701,6 +712,8 @@ class AugmentFreeAPI:
 
                     if result.get('backup_paths'):
                         success_msg += f", {len(result['backup_paths'])} backup(s) created"
+                    if result.get('pending_reboot'):
+                        success_msg += "; some locked files will be deleted after the next restart"
 
                     results["results"][ide_name] = {
                         "success": storage_success,
@@ -1183,15 +1196,18 @@ class AugmentFreeAPI:
                 "message": "Failed to mark first run as complete"
             }
 
-    def detect_ides(self) -> Dict[str, Any]:
+    def detect_ides(self, use_cache: bool = True) -> Dict[str, Any]:
         """
         Detect all installed IDEs on the system.
 
+        Args:
+            use_cache (bool): Reuse the cached result while the IDE directories are unchanged
+
         Returns:
             dict: Detection results with IDE list and summary
         """
         try:
-            result = detect_ides()
+            result = detect_ides(use_cache=use_cache)
             return result
         except Exception as e:
             return {
@@ -1386,8 +1402,8 @@ class AugmentFreeAPI:
             dict: Updated system information
         """
         try:
-            # Re-detect IDEs to get fresh information
-            detection_result = self.detect_ides()
+            # Re-detect IDEs to get fresh information, bypassing the detection cache
+            detection_result = self.detect_ides(use_cache=False)
             if detection_result["success"] and detection_result.get("ides"):
                 # Update current IDE info with the most relevant one
                 for ide in detection_result["ides"]:
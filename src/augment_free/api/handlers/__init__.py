@@ -9,7 +9,7 @@ This module contains individual handlers for different operations:
 
 from .telemetry import modify_telemetry_ids
 from .database import clean_augment_data
-from .workspace import clean_workspace_storage, clean_global_storage, clean_storage_comprehensive
+from .workspace import clean_workspace_storage, clean_global_storage, clean_storage_comprehensive, failure_count
 from .jetbrains import modify_jetbrains_ids, get_jetbrains_config_dir, get_jetbrains_info
 from .automation import run_full_automation, close_ide_processes, start_ide
 
@@ -20,6 +20,7 @@ __all__ = [
     "clean_workspace_storage",
     "clean_global_storage",
     "clean_storage_comprehensive",
+    "failure_count",
     "modify_jetbrains_ids",
     "get_jetbrains_config_dir",
     "get_jetbrains_info",
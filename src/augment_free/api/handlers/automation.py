@@ -21,7 +21,7 @@ except ImportError:
 
 from ..handlers.telemetry import modify_telemetry_ids
 from ..handlers.database import clean_augment_data
-from ..handlers.workspace import clean_workspace_storage, clean_global_storage
+from ..handlers.workspace import clean_workspace_storage, clean_global_storage, failure_count
 from ..handlers.jetbrains import modify_jetbrains_ids, get_jetbrains_config_dir
 from ...utils.ide_detector import detect_ides, IDEDetector
 from ...utils.translation import t
@@ -344,13 +344,13 @@ def run_full_automation(ide_info: Optional[Dict[str, Any]] = None,
 
                             # Enhanced success checking
                             workspace_success = workspace_result.get('success', True)
-                            if not workspace_success and len(workspace_result.get('failed_operations', [])) > 0:
+                            if not workspace_success and failure_count(workspace_result.get('failed_operations')) > 0:
                                 workspace_success = False
 
                             ide_cleaning_results["workspace"] = {
                                 "success": workspace_success,
                                 "data": workspace_result,
-                                "message": f"Workspace cleaned: {workspace_result.get('deleted_files_count', 0)} files deleted" if workspace_success else f"Workspace cleaning had issues: {len(workspace_result.get('failed_operations', []))} failed operations"
+                                "message": f"Workspace cleaned: {workspace_result.get('deleted_files_count', 0)} files deleted" if workspace_success else f"Workspace cleaning had issues: {failure_count(workspace_result.get('failed_operations'))} failed operations" + ("; locked items will be deleted after the next restart" if workspace_result.get('pending_reboot') else "")
                             }
                         except Exception as e:
                             ide_cleaning_results["workspace"] = {
@@ -376,13 +376,13 @@ def run_full_automation(ide_info: Optional[Dict[str, Any]] = None,
 
                             # Enhanced success checking
                             global_success = global_result.get('success', True)
-                            if not global_success and len(global_result.get('failed_operations', [])) > 0:
+                            if not global_success and failure_count(global_result.get('failed_operations')) > 0:
                                 global_success = False
 
                             ide_cleaning_results["global_storage"] = {
                                 "success": global_success,
                                 "data": global_result,
-                                "message": f"Global storage cleaned: {global_result.get('deleted_files_count', 0)} files deleted" if global_success else f"Global storage cleaning had issues: {len(global_result.get('failed_operations', []))} failed operations"
+                                "message": f"Global storage cleaned: {global_result.get('deleted_files_count', 0)} files deleted" if global_success else f"Global storage cleaning had issues: {failure_count(global_result.get('failed_operations'))} failed operations" + ("; locked items will be deleted after the next restart" if global_result.get('pending_reboot') else "")
                             }
                         except Exception as e:
                             ide_cleaning_results["global_storage"] = {
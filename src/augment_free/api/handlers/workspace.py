@@ -1,15 +1,76 @@
 import os
 import shutil
 import time
-import zipfile
 import stat
-import subprocess
 import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from ...utils.paths import get_workspace_storage_path, get_global_storage_path
 from pathlib import Path
 
-def remove_readonly(func, path, excinfo):
-    """Handle read-only files and directories during deletion"""
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# VS Code family executables closed before cleaning (taskkill matches case-insensitively)
+VSCODE_PROCESS_NAMES = ("code.exe", "code-insiders.exe", "Code - Insiders.exe",
+                        "vscodium.exe", "cursor.exe")
+
+# Lowercased process names matched through psutil on every platform
+VSCODE_PROCESS_MATCH = frozenset(
+    {name.lower() for name in VSCODE_PROCESS_NAMES}
+    | {"code", "code-insiders", "code - insiders", "code-oss", "codium", "vscodium", "cursor"}
+)
+
+# Number of example directories/files listed before a workspace clean
+SCAN_SAMPLE_SIZE = 5
+
+# Backup tuning: files are read on a small pool and written by a single thread
+BACKUP_COMPRESSLEVEL = 1
+BACKUP_READ_WORKERS = 8
+BACKUP_READ_AHEAD = 64
+BACKUP_READ_AHEAD_BYTES = 64 * 1024 * 1024
+BACKUP_INLINE_MAX_BYTES = 8 * 1024 * 1024
+BACKUP_COPY_CHUNK = 1024 * 1024
+BACKUP_WRITE_BUFFER = 4 * 1024 * 1024
+
+# MoveFileExW flag: defer the delete until the next system restart
+MOVEFILE_DELAY_UNTIL_REBOOT = 0x4
+
+# SHFileOperationW: delete, with FOF_SILENT | FOF_NOCONFIRMATION | FOF_NOERRORUI | FOF_NOCONFIRMMKDIR
+FO_DELETE = 0x3
+FOF_NO_UI = 0x614
+
+# Remove entries relative to an open directory fd where the platform allows it
+USE_DIR_FD = hasattr(os, 'fwalk') and {os.unlink, os.rmdir} <= os.supports_dir_fd
+
+# Failures are kept column-wise (one list per field) rather than one dict per row
+FAILED_OPERATION_FIELDS = ('type', 'path', 'error', 'error_type')
+FAILED_COMPRESSION_FIELDS = ('file', 'error')
+
+
+def new_failure_table(fields: tuple) -> dict:
+    """Create an empty columnar failure table with one list per field."""
+    return {field: [] for field in fields}
+
+
+def failure_count(table: dict) -> int:
+    """Return the number of rows recorded in a columnar failure table."""
+    if not table:
+        return 0
+    return len(next(iter(table.values())))
+
+def remove_readonly(func, path, excinfo, log=print):
+    """
+    Handle read-only files and directories during deletion.
+
+    Works as both an rmtree onerror (excinfo tuple) and onexc (exception) handler.
+    Warnings go to log.
+    """
     try:
         # Clear read-only attribute
         if os.path.exists(path):
@@ -17,45 +78,397 @@ def remove_readonly(func, path, excinfo):
             func(path)
         return True
     except Exception as e:
-        print(f"Warning: Could not remove readonly from {path}: {e}")
+        log(f"Warning: Could not remove readonly from {path}: {e}")
         return False
 
+def rmtree_readonly(path, log=print) -> None:
+    """
+    shutil.rmtree() that clears read-only attributes through remove_readonly.
+
+    Python 3.12 deprecates onerror in favour of onexc, so the handler is passed
+    as onexc there. Either way rmtree keeps its fd-based implementation
+    (unlinkat/rmdir with dir_fd) where shutil.rmtree.avoids_symlink_attacks.
+    """
+    handler = remove_readonly if log is print else partial(remove_readonly, log=log)
+    if sys.version_info >= (3, 12):
+        shutil.rmtree(path, onexc=handler)
+    else:
+        shutil.rmtree(path, onerror=handler)
+
+def unlink_file(path, dir_fd: int = None) -> None:
+    """
+    Delete a file, clearing the read-only attribute only when Windows refuses.
+
+    The file mode never blocks unlink on POSIX, so no chmod is attempted there.
+    """
+    try:
+        os.unlink(path, dir_fd=dir_fd)
+    except FileNotFoundError:
+        pass
+    except PermissionError:
+        if os.name != 'nt':
+            raise
+        os.chmod(path, stat.S_IWRITE)
+        os.unlink(path)
+
+def delete_tree_contents(root, handle_error) -> tuple[int, int]:
+    """
+    Delete everything below root file by file, deepest directories first.
+
+    Where the platform supports it (os.fwalk plus dir_fd for unlink/rmdir) each
+    entry is removed by its bare name relative to the already-open parent
+    directory, so no per-entry path string or Path object is built. Elsewhere
+    (Windows) os.walk supplies the joined path strings instead.
+
+    Failures are passed to handle_error(e, path, item_type) and skipped.
+    Returns (files_deleted, dirs_deleted).
+    """
+    files_deleted = 0
+    dirs_deleted = 0
+    root = os.fspath(root)
+
+    if USE_DIR_FD:
+        walker = os.fwalk(root, topdown=False)
+    else:
+        walker = ((dirpath, dirnames, filenames, None)
+                  for dirpath, dirnames, filenames in os.walk(root, topdown=False))
+
+    for dirpath, dirnames, filenames, dir_fd in walker:
+        for name in filenames:
+            target = name if dir_fd is not None else os.path.join(dirpath, name)
+            try:
+                unlink_file(target, dir_fd)
+                files_deleted += 1
+            except OSError as e:
+                handle_error(e, os.path.join(dirpath, name), 'file')
+
+        # Children were yielded first, so these directories are already empty
+        for name in dirnames:
+            target = name if dir_fd is not None else os.path.join(dirpath, name)
+            try:
+                try:
+                    os.rmdir(target, dir_fd=dir_fd)
+                except NotADirectoryError:
+                    # Symlink to a directory: remove the link, not the target
+                    os.unlink(target, dir_fd=dir_fd)
+                dirs_deleted += 1
+            except OSError as e:
+                handle_error(e, os.path.join(dirpath, name), 'directory')
+
+    return files_deleted, dirs_deleted
+
+def terminate_vscode_processes(timeout: float = 2.0) -> None:
+    """
+    Terminate running VS Code family processes found by one psutil scan.
+
+    Returns immediately when none are running. Otherwise waits up to timeout
+    for them to exit and kills whatever is left. Editors that are ancestors of
+    this process are skipped, since killing them would take this tool down too.
+    """
+    protected = {proc.pid for proc in psutil.Process().parents()}
+    targets = [proc for proc in psutil.process_iter(['name'])
+               if (proc.info['name'] or '').lower() in VSCODE_PROCESS_MATCH
+               and proc.pid not in protected]
+    if not targets:
+        return
+
+    for proc in targets:
+        try:
+            proc.terminate()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+
+    _, alive = psutil.wait_procs(targets, timeout=timeout)
+    for proc in alive:
+        try:
+            proc.kill()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+
 def kill_vscode_processes():
     """Kill all VS Code related processes to unlock files"""
     try:
+        if PSUTIL_AVAILABLE:
+            terminate_vscode_processes()
+            return True
+
         if sys.platform == "win32":
-            # Kill common VS Code processes
-            processes = ["code.exe", "Code.exe", "code-insiders.exe", "Code - Insiders.exe",
-                        "vscodium.exe", "VSCodium.exe", "cursor.exe", "Cursor.exe"]
+            import subprocess
 
-            for process in processes:
-                try:
-                    subprocess.run(["taskkill", "/F", "/IM", process],
-                                 capture_output=True, check=False)
-                except Exception:
-                    pass
+            # Kill common VS Code processes with a single taskkill call
+            command = ["taskkill", "/F"]
+            for process in VSCODE_PROCESS_NAMES:
+                command += ["/IM", process]
+            try:
+                subprocess.run(command, capture_output=True, check=False)
+            except Exception:
+                pass
 
-            # Wait for processes to fully terminate
+            # Without psutil there is no way to poll, so wait for processes to fully terminate
             time.sleep(2)
             return True
+
+        return False
     except Exception as e:
         print(f"Warning: Could not kill VS Code processes: {e}")
         return False
 
-def force_delete_directory(path: Path) -> tuple[bool, list]:
+def scan_directory(root: Path) -> dict:
+    """
+    Walk root once and collect everything the backup and the reports need.
+
+    Returns:
+        dict: {
+            'files': list of (path, arcname, size) tuples,
+            'total_files': int,
+            'total_dirs': int,
+            'total_bytes': int,
+            'sample_dirs': first SCAN_SAMPLE_SIZE directories, relative to root,
+            'skipped_cycles': directories not descended because they were already visited
+        }
+
+    Symlinks are never followed. Directories are also identified by
+    (st_dev, st_ino) so a loop that does not go through a symlink (a Windows
+    junction or a bind mount pointing at an ancestor) is visited only once.
+    Filesystems that report st_ino as 0 get no such check.
+    """
+    scan = {'files': [], 'total_files': 0, 'total_dirs': 0, 'total_bytes': 0,
+            'sample_dirs': [], 'skipped_cycles': []}
+    root_str = os.fspath(root)
+    prefix_len = len(os.path.join(root_str, ''))
+    visited = set()
+    stack = [root_str]
+    while stack:
+        dir_path = stack.pop()
+        try:
+            st = os.stat(dir_path)
+            # st_ino is only meaningful when non-zero; some Windows and
+            # network filesystems report 0, and no cycle check is possible there
+            if st.st_ino:
+                dir_key = (st.st_dev, st.st_ino)
+                if dir_key in visited:
+                    scan['skipped_cycles'].append(dir_path)
+                    continue
+                visited.add(dir_key)
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            scan['total_dirs'] += 1
+                            if len(scan['sample_dirs']) < SCAN_SAMPLE_SIZE:
+                                scan['sample_dirs'].append(entry.path[prefix_len:])
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            size = entry.stat().st_size
+                            scan['files'].append((entry.path, entry.path[prefix_len:], size))
+                            scan['total_files'] += 1
+                            scan['total_bytes'] += size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return scan
+
+def _backup_skip_reason(scan: dict, create_backup: bool, backup_max_size_mb: float = None) -> str | None:
+    """Return why the backup should be skipped, or None to create it."""
+    if not create_backup:
+        return "backup disabled"
+    if scan['total_files'] == 0:
+        return "directory is empty"
+    if backup_max_size_mb is not None and scan['total_bytes'] > backup_max_size_mb * 1024 * 1024:
+        size_mb = scan['total_bytes'] / (1024 * 1024)
+        return f"{size_mb:.1f} MB exceeds the {backup_max_size_mb} MB backup limit"
+    return None
+
+def _read_backup_member(file_path: str, arcname: str) -> tuple:
+    """Read one file for the backup; runs on the reader pool."""
+    import zipfile
+
+    zinfo = zipfile.ZipInfo.from_file(file_path, arcname, strict_timestamps=False)
+    with open(file_path, 'rb') as f:
+        return zinfo, f.read()
+
+def _stream_backup_member(zipf, file_path: str, arcname: str) -> None:
+    """Copy a large file into the archive in BACKUP_COPY_CHUNK pieces."""
+    import zipfile
+
+    zinfo = zipfile.ZipInfo.from_file(file_path, arcname, strict_timestamps=False)
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    # ZipFile.write() sets the level the same way; 3.13 renamed the attribute
+    if hasattr(zinfo, 'compress_level'):
+        zinfo.compress_level = BACKUP_COMPRESSLEVEL
+    else:
+        zinfo._compresslevel = BACKUP_COMPRESSLEVEL
+    with open(file_path, 'rb') as src, zipf.open(zinfo, 'w') as dest:
+        shutil.copyfileobj(src, dest, BACKUP_COPY_CHUNK)
+
+def create_backup_zip(files: list, backup_path, failed_compressions: dict, log=print) -> int:
+    """
+    Write a zip backup of the (path, arcname, size) entries produced by scan_directory().
+
+    Members are deflated at compresslevel 1: the backup only has to be
+    restorable, and level 1 is several times faster than the default level 6
+    for a slightly larger archive. Small files are read on a thread pool while
+    this thread compresses and writes them in order. Reads run ahead of the
+    writer by at most BACKUP_READ_AHEAD files and BACKUP_READ_AHEAD_BYTES of
+    file data, so no more than that budget plus one file of at most
+    BACKUP_INLINE_MAX_BYTES is held in memory; larger files are streamed by
+    the writer in BACKUP_COPY_CHUNK pieces instead. The archive is
+    written through a BACKUP_WRITE_BUFFER-sized file buffer, and timestamps
+    outside the zip range are clamped rather than failing the member. Files
+    that cannot be archived are appended to the failed_compressions columns
+    and reported through log.
+
+    Returns the number of files written to the archive.
+    """
+    import zipfile
+
+    archived = 0
+    pending = deque()
+    # Bytes of small files submitted for reading but not yet written
+    pending_bytes = 0
+
+    def write_pending(keep: int, keep_bytes: int) -> None:
+        nonlocal archived, pending_bytes
+        while pending and (len(pending) > keep or pending_bytes > keep_bytes):
+            file_path, arcname, future, size = pending.popleft()
+            if future is not None:
+                pending_bytes -= size
+            try:
+                if future is None:
+                    _stream_backup_member(zipf, file_path, arcname)
+                else:
+                    zinfo, data = future.result()
+                    zipf.writestr(zinfo, data, compress_type=zipfile.ZIP_DEFLATED,
+                                  compresslevel=BACKUP_COMPRESSLEVEL)
+                archived += 1
+            except Exception as e:
+                failed_compressions['file'].append(file_path)
+                failed_compressions['error'].append(str(e))
+                log(f"⚠️ Failed to compress {file_path}: {e}")
+
+    with open(backup_path, 'wb', buffering=BACKUP_WRITE_BUFFER) as backup_file, \
+            zipfile.ZipFile(backup_file, 'w', zipfile.ZIP_DEFLATED,
+                            compresslevel=BACKUP_COMPRESSLEVEL, allowZip64=True,
+                            strict_timestamps=False) as zipf, \
+            ThreadPoolExecutor(max_workers=BACKUP_READ_WORKERS) as executor:
+        for file_path, arcname, size in files:
+            if size <= BACKUP_INLINE_MAX_BYTES:
+                future = executor.submit(_read_backup_member, file_path, arcname)
+                pending_bytes += size
+            else:
+                future = None
+            pending.append((file_path, arcname, future, size))
+            write_pending(BACKUP_READ_AHEAD, BACKUP_READ_AHEAD_BYTES)
+        write_pending(0, 0)
+    return archived
+
+def shell_delete_directory(path: Path) -> None:
+    """
+    Recursively delete path with SHFileOperationW(FO_DELETE), without any UI.
+
+    Windows only. Runs in-process, so unlike `cmd /c rmdir /S /Q` no cmd.exe is
+    spawned and the path never goes through shell quoting. Raises OSError on failure.
+    """
+    import ctypes
+    from ctypes import wintypes
+
+    class SHFILEOPSTRUCTW(ctypes.Structure):
+        # shellapi.h packs this struct to 1 byte on 32-bit Windows
+        _pack_ = 1 if ctypes.sizeof(ctypes.c_void_p) == 4 else 8
+        _fields_ = [
+            ("hwnd", wintypes.HWND),
+            ("wFunc", wintypes.UINT),
+            ("pFrom", wintypes.LPCWSTR),
+            ("pTo", wintypes.LPCWSTR),
+            ("fFlags", wintypes.WORD),
+            ("fAnyOperationsAborted", wintypes.BOOL),
+            ("hNameMappings", wintypes.LPVOID),
+            ("lpszProgressTitle", wintypes.LPCWSTR),
+        ]
+
+    operation = SHFILEOPSTRUCTW()
+    operation.wFunc = FO_DELETE
+    # pFrom is a double-NUL-terminated list; ctypes appends the second NUL
+    operation.pFrom = str(path.resolve()) + '\0'
+    operation.fFlags = FOF_NO_UI
+
+    code = ctypes.windll.shell32.SHFileOperationW(ctypes.byref(operation))
+    if code != 0:
+        raise OSError(f"SHFileOperationW returned 0x{code:x}")
+    if operation.fAnyOperationsAborted:
+        raise OSError("SHFileOperationW was aborted")
+
+def schedule_delete_on_reboot(paths: list) -> tuple[list, list]:
+    """
+    Queue the given paths for deletion at the next reboot.
+
+    Windows only. MoveFileExW with MOVEFILE_DELAY_UNTIL_REBOOT returns at once
+    instead of waiting for the IDE to release its handles. Paths are queued in
+    the order given, so children must come before their parent directories.
+    Needs administrator rights.
+
+    Returns (queued_paths, errors) tuple.
+    """
+    import ctypes
+
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    queued = []
+    errors = []
+
+    for entry in paths:
+        if kernel32.MoveFileExW(entry, None, MOVEFILE_DELAY_UNTIL_REBOOT):
+            queued.append(entry)
+        else:
+            errors.append(f"Could not queue {entry} for deletion: {ctypes.WinError(ctypes.get_last_error())}")
+
+    return queued, errors
+
+def queue_locked_entries_for_reboot(result: dict, log=print) -> None:
+    """
+    Queue what the file-by-file pass could not delete for removal at the next reboot.
+
+    Windows only. Only the entries recorded in result['failed_operations'] that
+    are still on disk are queued, not the whole tree: MoveFileExW deletes by
+    path at boot, so anything queued that the IDE later recreates would be lost.
+    delete_tree_contents() records failures bottom-up, so children are queued
+    before their directories. Sets result['pending_reboot'] and
+    result['pending_reboot_paths'] when anything was queued.
+    """
+    failed = result['failed_operations']
+    locked = [path for path, item_type in zip(failed['path'], failed['type'])
+              if item_type in ('file', 'directory', 'main_directory') and os.path.lexists(path)]
+    if not locked:
+        return
+
+    try:
+        queued, errors = schedule_delete_on_reboot(locked)
+    except Exception as e:
+        queued, errors = [], [f"Delete-on-reboot scheduling failed: {e}"]
+    result['deletion_errors'].extend(errors)
+    if queued:
+        result['pending_reboot'] = True
+        result['pending_reboot_paths'] = queued
+        log(f"⏳ {len(queued)} locked item(s) queued for deletion on next reboot")
+
+def force_delete_directory(path: Path, log=print) -> tuple[bool, list, str]:
     """
     Force delete a directory and all its contents.
-    Returns (success, errors) tuple.
+
+    Returns (success, errors, method) tuple, where method names the strategy
+    that succeeded: 'bulk_delete', 'long_path_delete' or 'shell_delete'.
     """
     errors = []
     try:
         if not path.exists():
-            return True, []
+            return True, [], 'bulk_delete'
 
         # First try: Standard deletion
         try:
-            shutil.rmtree(path, onerror=remove_readonly)
-            return True, []
+            rmtree_readonly(path, log)
+            if not path.exists():
+                return True, [], 'bulk_delete'
+            errors.append("Standard deletion left entries behind")
         except Exception as e:
             errors.append(f"Standard deletion failed: {e}")
 
@@ -63,37 +476,46 @@ def force_delete_directory(path: Path) -> tuple[bool, list]:
         if os.name == 'nt':
             try:
                 path_str = '\\\\?\\' + str(path.resolve())
-                shutil.rmtree(path_str, onerror=remove_readonly)
-                return True, []
+                rmtree_readonly(path_str, log)
+                if not path.exists():
+                    return True, [], 'long_path_delete'
+                errors.append("Long path deletion left entries behind")
             except Exception as e:
                 errors.append(f"Long path deletion failed: {e}")
 
-        # Third try: Use Windows rmdir command
+        # Third try: Recursive delete through the Windows shell API
         if os.name == 'nt':
             try:
-                subprocess.run(['rmdir', '/S', '/Q', str(path)],
-                             check=True, capture_output=True, shell=True)
-                return True, []
+                shell_delete_directory(path)
+                if not path.exists():
+                    return True, [], 'shell_delete'
+                errors.append("Shell delete left entries behind")
             except Exception as e:
-                errors.append(f"CMD rmdir failed: {e}")
+                errors.append(f"Shell delete failed: {e}")
 
-        return False, errors
+        return False, errors, 'failed'
     except Exception as e:
         errors.append(f"Force delete failed: {e}")
-        return False, errors
+        return False, errors, 'failed'
 
-def clean_workspace_storage(editor_type: str = "VSCodium", workspace_storage_path: str = None) -> dict:
+def clean_workspace_storage(editor_type: str = "VSCodium", workspace_storage_path: str = None,
+                            create_backup: bool = True, backup_max_size_mb: float = None,
+                            kill_processes: bool = True, log=print) -> dict:
     """
     Cleans the workspace storage directory after creating a backup.
 
     Args:
         editor_type (str): Editor type, either "VSCodium" or "Code" (VS Code)
         workspace_storage_path (str, optional): Verified path to workspaceStorage directory
+        create_backup (bool): Whether to zip the directory before deleting it
+        backup_max_size_mb (float, optional): Skip the backup when the directory is larger than this
+        kill_processes (bool): Whether to close running IDE processes first
+        log (callable): Receives each progress message; print by default
 
     This function:
-    1. Kills any running IDE processes to unlock files
+    1. Kills any running IDE processes to unlock files (unless kill_processes is False)
     2. Gets the workspace storage path
-    3. Creates a zip backup of all files in the directory
+    3. Creates a zip backup of all files in the directory (unless skipped)
     4. Deletes all files in the directory
 
     Returns:
@@ -103,15 +525,17 @@ def clean_workspace_storage(editor_type: str = "VSCodium", workspace_storage_pat
             'deleted_files_count': int,
             'editor_type': str,
             'process_kill_attempted': bool,
-            'deletion_errors': list
+            'deletion_errors': list,
+            'pending_reboot': bool  # Locked entries queued for deletion at the next reboot (Windows)
         }
     """
     result = {
         'editor_type': editor_type,
         'process_kill_attempted': False,
         'deletion_errors': [],
-        'failed_operations': [],
-        'failed_compressions': []
+        'pending_reboot': False,
+        'failed_operations': new_failure_table(FAILED_OPERATION_FIELDS),
+        'failed_compressions': new_failure_table(FAILED_COMPRESSION_FIELDS)
     }
 
     # Use provided path or fall back to system-detected path
@@ -128,151 +552,109 @@ def clean_workspace_storage(editor_type: str = "VSCodium", workspace_storage_pat
     workspace_path = Path(workspace_path)
 
     # Kill IDE processes to unlock files
-    print(f"Attempting to close {editor_type} processes...")
-    result['process_kill_attempted'] = kill_vscode_processes()
-
-    # Create backup filename with timestamp
-    timestamp = int(time.time())
-    backup_path = f"{workspace_path}_backup_{timestamp}.zip"
-
-    # Create zip backup with better error handling
-    print(f"Creating backup at: {backup_path}")
-    try:
-        with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for file_path in workspace_path.rglob('*'):
-                if file_path.is_file():
-                    try:
-                        arcname = file_path.relative_to(workspace_path)
-                        zipf.write(str(file_path), str(arcname))
-                    except (OSError, PermissionError, zipfile.BadZipFile) as e:
-                        result['failed_compressions'].append({
-                            'file': str(file_path),
-                            'error': str(e)
-                        })
-                        continue
-    except Exception as e:
-        print(f"Warning: Backup creation failed: {e}")
-        result['backup_error'] = str(e)
+    if kill_processes:
+        log(f"Attempting to close {editor_type} processes...")
+        result['process_kill_attempted'] = kill_vscode_processes()
+
+    # Walk the tree once; the counts feed both the backup decision and the report
+    scan = scan_directory(workspace_path)
+    total_files = scan['total_files']
+    result['deletion_errors'].extend(
+        f"Skipped directory cycle: {path}" for path in scan['skipped_cycles'])
+    result['total_files_found'] = total_files
+
+    backup_path = ''
+    skip_reason = _backup_skip_reason(scan, create_backup, backup_max_size_mb)
+    if skip_reason:
+        log(f"⏭️  Skipping backup: {skip_reason}")
+        result['backup_skipped'] = skip_reason
+    else:
+        # Create backup filename with timestamp
+        timestamp = int(time.time())
+        backup_path = f"{workspace_path}_backup_{timestamp}.zip"
 
-    # Count files before deletion
-    try:
-        total_files = sum(1 for _ in workspace_path.rglob('*') if _.is_file())
-        result['total_files_found'] = total_files
-    except Exception as e:
-        total_files = 0
-        result['file_count_error'] = str(e)
+        # Create zip backup with better error handling
+        log(f"Creating backup at: {backup_path}")
+        try:
+            create_backup_zip(scan['files'], backup_path, result['failed_compressions'], log)
+        except Exception as e:
+            log(f"Warning: Backup creation failed: {e}")
+            result['backup_error'] = str(e)
 
     # Delete all files in the directory with enhanced error handling
-    print(f"🗑️  Starting deletion of workspace storage: {workspace_path}")
-
-    # Show what will be deleted
-    try:
-        workspace_items = list(workspace_path.rglob('*'))
-        workspace_dirs = [p for p in workspace_items if p.is_dir()]
-        workspace_files = [p for p in workspace_items if p.is_file()]
-
-        print(f"📊 Workspace storage contents:")
-        print(f"   • {len(workspace_dirs)} directories")
-        print(f"   • {len(workspace_files)} files")
-
-        # Show some examples
-        if workspace_dirs:
-            print(f"📁 Sample directories:")
-            for i, dir_path in enumerate(workspace_dirs[:5]):
-                rel_path = dir_path.relative_to(workspace_path)
-                print(f"   {i+1}. {rel_path}")
-            if len(workspace_dirs) > 5:
-                print(f"   ... and {len(workspace_dirs) - 5} more directories")
-
-        if workspace_files:
-            print(f"📄 Sample files:")
-            for i, file_path in enumerate(workspace_files[:5]):
-                rel_path = file_path.relative_to(workspace_path)
-                try:
-                    size = file_path.stat().st_size
-                    print(f"   {i+1}. {rel_path} ({size} bytes)")
-                except:
-                    print(f"   {i+1}. {rel_path}")
-            if len(workspace_files) > 5:
-                print(f"   ... and {len(workspace_files) - 5} more files")
-
-    except Exception as e:
-        print(f"⚠️  Could not enumerate workspace contents: {e}")
-
-    def handle_error(e: Exception, path: Path, item_type: str):
-        error_info = {
-            'type': item_type,
-            'path': str(path),
-            'error': str(e),
-            'error_type': type(e).__name__
-        }
-        result['failed_operations'].append(error_info)
-        print(f"❌ Failed to delete {item_type}: {path.name} - {e}")
+    log(f"🗑️  Starting deletion of workspace storage: {workspace_path}")
+
+    # Show what will be deleted (taken from the scan above, no extra walk)
+    total_dirs = scan['total_dirs']
+    log(f"📊 Workspace storage contents:")
+    log(f"   • {total_dirs} directories")
+    log(f"   • {total_files} files")
+
+    # Show some examples
+    if scan['sample_dirs']:
+        log(f"📁 Sample directories:")
+        for i, rel_path in enumerate(scan['sample_dirs']):
+            log(f"   {i+1}. {rel_path}")
+        if total_dirs > SCAN_SAMPLE_SIZE:
+            log(f"   ... and {total_dirs - SCAN_SAMPLE_SIZE} more directories")
+
+    if scan['files']:
+        log(f"📄 Sample files:")
+        for i, (_, rel_path, size) in enumerate(scan['files'][:SCAN_SAMPLE_SIZE]):
+            log(f"   {i+1}. {rel_path} ({size} bytes)")
+        if total_files > SCAN_SAMPLE_SIZE:
+            log(f"   ... and {total_files - SCAN_SAMPLE_SIZE} more files")
+
+    def handle_error(e: Exception, path, item_type: str):
+        failed = result['failed_operations']
+        failed['type'].append(item_type)
+        failed['path'].append(str(path))
+        failed['error'].append(str(e))
+        failed['error_type'].append(type(e).__name__)
+        log(f"❌ Failed to delete {item_type}: {os.path.basename(path)} - {e}")
 
     # Strategy 1: Try to delete the entire directory tree at once
-    success, errors = force_delete_directory(workspace_path)
+    success, errors, method = force_delete_directory(workspace_path, log)
     if success:
-        print("✅ Successfully deleted workspace storage directory")
-        result['deletion_method'] = 'bulk_delete'
+        log("✅ Successfully deleted workspace storage directory")
+        result['deletion_method'] = method
     else:
-        print("⚠️ Bulk deletion failed, trying file-by-file approach...")
+        log("⚠️ Bulk deletion failed, trying file-by-file approach...")
         result['deletion_errors'].extend(errors)
         result['deletion_method'] = 'file_by_file'
 
         # Strategy 2: File-by-file deletion
         if workspace_path.exists():
-            # Delete files first
-            files_deleted = 0
-            for file_path in workspace_path.rglob('*'):
-                if file_path.is_file():
-                    try:
-                        # Clear read-only attribute if present
-                        os.chmod(str(file_path), stat.S_IWRITE)
-                        file_path.unlink(missing_ok=True)
-                        files_deleted += 1
-                    except (OSError, PermissionError) as e:
-                        handle_error(e, file_path, 'file')
-
-            # Delete directories from deepest to root
-            dirs_to_delete = []
-            try:
-                dirs_to_delete = sorted(
-                    [p for p in workspace_path.rglob('*') if p.is_dir()],
-                    key=lambda x: len(str(x).split(os.sep)),
-                    reverse=True
-                )
-            except Exception as e:
-                result['deletion_errors'].append(f"Could not enumerate directories: {e}")
-
-            dirs_deleted = 0
-            for dir_path in dirs_to_delete:
-                try:
-                    dir_path.rmdir()
-                    dirs_deleted += 1
-                except (OSError, PermissionError) as e:
-                    handle_error(e, dir_path, 'directory')
+            # Delete files and directories in one bottom-up walk
+            files_deleted, dirs_deleted = delete_tree_contents(workspace_path, handle_error)
 
             # Try to delete the main directory
             try:
                 if workspace_path.exists():
                     workspace_path.rmdir()
-                    print("✅ Successfully deleted main workspace directory")
+                    log("✅ Successfully deleted main workspace directory")
             except Exception as e:
                 handle_error(e, workspace_path, 'main_directory')
 
             result['files_deleted_individually'] = files_deleted
             result['dirs_deleted_individually'] = dirs_deleted
 
+            # Strategy 3: entries still locked by the IDE are removed at next reboot
+            if os.name == 'nt' and workspace_path.exists():
+                queue_locked_entries_for_reboot(result, log)
+
     # Final verification
     workspace_still_exists = workspace_path.exists()
     result['workspace_still_exists'] = workspace_still_exists
 
     if not workspace_still_exists:
-        print("✅ Workspace storage successfully cleaned")
+        log("✅ Workspace storage successfully cleaned")
         result['success'] = True
     else:
-        print("⚠️ Workspace storage partially cleaned - some files may remain")
-        result['success'] = len(result['failed_operations']) == 0
+        log("⚠️ Workspace storage partially cleaned - some files may remain")
+        # Queued entries are still on disk: not a success until the reboot
+        result['success'] = (failure_count(result['failed_operations']) == 0
+                             and not result['pending_reboot'])
 
     # Prepare return data
     result.update({
@@ -283,17 +665,22 @@ def clean_workspace_storage(editor_type: str = "VSCodium", workspace_storage_pat
     return result
 
 
-def clean_global_storage(editor_type: str = "VSCodium", global_storage_path: str = None) -> dict:
+def clean_global_storage(editor_type: str = "VSCodium", global_storage_path: str = None,
+                         create_backup: bool = True, backup_max_size_mb: float = None,
+                         log=print) -> dict:
     """
     Cleans the globalStorage directory after creating a backup.
 
     Args:
         editor_type (str): Editor type, either "VSCodium" or "Code" (VS Code)
         global_storage_path (str, optional): Verified path to globalStorage directory
+        create_backup (bool): Whether to zip the directory before deleting it
+        backup_max_size_mb (float, optional): Skip the backup when the directory is larger than this
+        log (callable): Receives each progress message; print by default
 
     This function:
     1. Gets the globalStorage path
-    2. Creates a zip backup of all files in the directory
+    2. Creates a zip backup of all files in the directory (unless skipped)
     3. Deletes all files in the directory
 
     Returns:
@@ -302,14 +689,16 @@ def clean_global_storage(editor_type: str = "VSCodium", global_storage_path: str
             'backup_path': str,
             'deleted_files_count': int,
             'editor_type': str,
-            'deletion_errors': list
+            'deletion_errors': list,
+            'pending_reboot': bool  # Locked entries queued for deletion at the next reboot (Windows)
         }
     """
     result = {
         'editor_type': editor_type,
         'deletion_errors': [],
-        'failed_operations': [],
-        'failed_compressions': []
+        'pending_reboot': False,
+        'failed_operations': new_failure_table(FAILED_OPERATION_FIELDS),
+        'failed_compressions': new_failure_table(FAILED_COMPRESSION_FIELDS)
     }
 
     # Use provided path or fall back to system-detected path
@@ -327,108 +716,88 @@ def clean_global_storage(editor_type: str = "VSCodium", global_storage_path: str
         })
         return result
 
-    print(f"🧹 Starting globalStorage cleaning for {editor_type}")
-    print(f"📁 GlobalStorage path: {global_path}")
-
-    # Create backup
-    backup_dir = global_path.parent / "backups"
-    backup_dir.mkdir(exist_ok=True)
-
-    timestamp = time.strftime("%Y%m%d_%H%M%S")
-    backup_filename = f"globalStorage_backup_{editor_type}_{timestamp}.zip"
-    backup_path = backup_dir / backup_filename
-
-    total_files = 0
+    log(f"🧹 Starting globalStorage cleaning for {editor_type}")
+    log(f"📁 GlobalStorage path: {global_path}")
 
     def handle_error(error, path, operation_type):
-        error_msg = f"Failed to {operation_type} {path}: {error}"
-        result['failed_operations'].append(error_msg)
-        print(f"❌ {error_msg}")
+        failed = result['failed_operations']
+        failed['type'].append(operation_type)
+        failed['path'].append(str(path))
+        failed['error'].append(str(error))
+        failed['error_type'].append(type(error).__name__)
+        log(f"❌ Failed to {operation_type} {path}: {error}")
+
+    # Walk the tree once; the counts feed both the backup decision and the report
+    scan = scan_directory(global_path)
+    total_files = scan['total_files']
+    result['deletion_errors'].extend(
+        f"Skipped directory cycle: {path}" for path in scan['skipped_cycles'])
+
+    backup_path = ''
+    skip_reason = _backup_skip_reason(scan, create_backup, backup_max_size_mb)
+    if skip_reason:
+        log(f"⏭️  Skipping backup: {skip_reason}")
+        result['backup_skipped'] = skip_reason
+    else:
+        # Create backup
+        backup_dir = global_path.parent / "backups"
+        backup_dir.mkdir(exist_ok=True)
 
-    # Create backup zip
-    try:
-        with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for file_path in global_path.rglob('*'):
-                if file_path.is_file():
-                    try:
-                        # Calculate relative path for zip
-                        relative_path = file_path.relative_to(global_path)
-                        zipf.write(file_path, relative_path)
-                        total_files += 1
-                    except Exception as e:
-                        result['failed_compressions'].append(f"Failed to compress {file_path}: {e}")
-                        print(f"⚠️ Failed to compress {file_path}: {e}")
-
-        print(f"💾 Created backup with {total_files} files: {backup_path}")
-    except Exception as e:
-        handle_error(e, backup_path, 'create backup')
-        # Continue with deletion even if backup fails
-        print("⚠️ Backup failed, but continuing with deletion...")
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        backup_filename = f"globalStorage_backup_{editor_type}_{timestamp}.zip"
+        backup_path = backup_dir / backup_filename
+
+        # Create backup zip
+        try:
+            archived = create_backup_zip(scan['files'], backup_path, result['failed_compressions'], log)
+            log(f"💾 Created backup with {archived} files: {backup_path}")
+        except Exception as e:
+            handle_error(e, backup_path, 'create backup')
+            # Continue with deletion even if backup fails
+            log("⚠️ Backup failed, but continuing with deletion...")
 
     # Strategy 1: Try to delete the entire directory tree at once
-    success, errors = force_delete_directory(global_path)
+    success, errors, method = force_delete_directory(global_path, log)
     if success:
-        print("✅ Successfully deleted globalStorage directory")
-        result['deletion_method'] = 'bulk_delete'
+        log("✅ Successfully deleted globalStorage directory")
+        result['deletion_method'] = method
     else:
-        print("⚠️ Bulk deletion failed, trying file-by-file approach...")
+        log("⚠️ Bulk deletion failed, trying file-by-file approach...")
         result['deletion_errors'].extend(errors)
         result['deletion_method'] = 'file_by_file'
 
         # Strategy 2: File-by-file deletion
         if global_path.exists():
-            # Delete files first
-            files_deleted = 0
-            for file_path in global_path.rglob('*'):
-                if file_path.is_file():
-                    try:
-                        # Clear read-only attribute if present
-                        os.chmod(str(file_path), stat.S_IWRITE)
-                        file_path.unlink(missing_ok=True)
-                        files_deleted += 1
-                    except (OSError, PermissionError) as e:
-                        handle_error(e, file_path, 'file')
-
-            # Delete directories from deepest to root
-            dirs_to_delete = []
-            try:
-                dirs_to_delete = sorted(
-                    [p for p in global_path.rglob('*') if p.is_dir()],
-                    key=lambda x: len(str(x).split(os.sep)),
-                    reverse=True
-                )
-            except Exception as e:
-                result['deletion_errors'].append(f"Could not enumerate directories: {e}")
-
-            dirs_deleted = 0
-            for dir_path in dirs_to_delete:
-                try:
-                    dir_path.rmdir()
-                    dirs_deleted += 1
-                except (OSError, PermissionError) as e:
-                    handle_error(e, dir_path, 'directory')
+            # Delete files and directories in one bottom-up walk
+            files_deleted, dirs_deleted = delete_tree_contents(global_path, handle_error)
 
             # Try to delete the main directory
             try:
                 if global_path.exists():
                     global_path.rmdir()
-                    print("✅ Successfully deleted main globalStorage directory")
+                    log("✅ Successfully deleted main globalStorage directory")
             except Exception as e:
                 handle_error(e, global_path, 'main_directory')
 
             result['files_deleted_individually'] = files_deleted
             result['dirs_deleted_individually'] = dirs_deleted
 
+            # Strategy 3: entries still locked by the IDE are removed at next reboot
+            if os.name == 'nt' and global_path.exists():
+                queue_locked_entries_for_reboot(result, log)
+
     # Final verification
     global_still_exists = global_path.exists()
     result['global_still_exists'] = global_still_exists
 
     if not global_still_exists:
-        print("✅ GlobalStorage successfully cleaned")
+        log("✅ GlobalStorage successfully cleaned")
         result['success'] = True
     else:
-        print("⚠️ GlobalStorage partially cleaned - some files may remain")
-        result['success'] = len(result['failed_operations']) == 0
+        log("⚠️ GlobalStorage partially cleaned - some files may remain")
+        # Queued entries are still on disk: not a success until the reboot
+        result['success'] = (failure_count(result['failed_operations']) == 0
+                             and not result['pending_reboot'])
 
     # Prepare return data
     result.update({
@@ -439,11 +808,41 @@ def clean_global_storage(editor_type: str = "VSCodium", global_storage_path: str
     return result
 
 
+# Serializes prefixed log lines from concurrently running cleaners
+_LOG_LOCK = threading.Lock()
+
+def _submit_logged(executor, prefix: str, cleaner, *args, **kwargs):
+    """
+    Submit cleaner with each of its log lines printed as produced, tagged with prefix.
+
+    The two concurrent cleaners stay readable on a shared console while still
+    showing progress during a long clean.
+    """
+    def log(message: str) -> None:
+        text = "\n".join(f"[{prefix}] {line}" for line in str(message).splitlines())
+        # print() writes the text and the newline separately; the lock keeps
+        # the other cleaner's line from landing between the two
+        with _LOG_LOCK:
+            print(text)
+
+    return executor.submit(cleaner, *args, log=log, **kwargs)
+
+def _cleaner_outcome(future, label: str) -> dict:
+    """Return a cleaner's result, or a failed result if it raised."""
+    try:
+        return future.result()
+    except Exception as e:
+        print(f"❌ {label} cleaning failed: {e}")
+        return {'success': False, 'error': str(e), 'message': f"Failed to clean {label}"}
+
+
 def clean_storage_comprehensive(editor_type: str = "VSCodium",
                                clean_global: bool = True,
                                clean_workspace: bool = True,
                                global_storage_path: str = None,
-                               workspace_storage_path: str = None) -> dict:
+                               workspace_storage_path: str = None,
+                               create_backup: bool = True,
+                               backup_max_size_mb: float = None) -> dict:
     """
     Comprehensive storage cleaning function that can clean globalStorage, workspaceStorage, or both.
 
@@ -453,6 +852,8 @@ def clean_storage_comprehensive(editor_type: str = "VSCodium",
         clean_workspace (bool): Whether to clean workspaceStorage directory
         global_storage_path (str, optional): Verified path to globalStorage directory
         workspace_storage_path (str, optional): Verified path to workspaceStorage directory
+        create_backup (bool): Whether to zip each directory before deleting it
+        backup_max_size_mb (float, optional): Skip backups of directories larger than this
 
     Returns:
         dict: A dictionary containing comprehensive operation results
@@ -463,18 +864,38 @@ def clean_storage_comprehensive(editor_type: str = "VSCodium",
         'global_storage_result': None,
         'workspace_storage_result': None,
         'overall_success': True,
+        'process_kill_attempted': False,
         'total_files_deleted': 0,
-        'backup_paths': []
+        'backup_paths': [],
+        'pending_reboot': False
     }
 
     print(f"🧹 Starting comprehensive storage cleaning for {editor_type}")
     print(f"   - Clean globalStorage: {clean_global}")
     print(f"   - Clean workspaceStorage: {clean_workspace}")
 
-    # Clean globalStorage if requested
+    # Close the editor once up front so the two cleaners don't both run taskkill
+    if clean_workspace:
+        print(f"Attempting to close {editor_type} processes...")
+        result['process_kill_attempted'] = kill_vscode_processes()
+
+    # globalStorage and workspaceStorage are disjoint trees, so clean them concurrently;
+    # each cleaner's lines carry a prefix so the interleaved output stays readable
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        if clean_global:
+            print("🗂️ Cleaning globalStorage...")
+            global_future = _submit_logged(executor, "global", clean_global_storage, editor_type,
+                                           global_storage_path, create_backup, backup_max_size_mb)
+        if clean_workspace:
+            print("💾 Cleaning workspaceStorage...")
+            workspace_future = _submit_logged(executor, "workspace", clean_workspace_storage, editor_type,
+                                              workspace_storage_path, create_backup, backup_max_size_mb,
+                                              kill_processes=False)
+
+    # Collect globalStorage results
     if clean_global:
-        print("🗂️ Cleaning globalStorage...")
-        global_result = clean_global_storage(editor_type, global_storage_path)
+        # A failure on one side must not hide a deletion the other side completed
+        global_result = _cleaner_outcome(global_future, "globalStorage")
         result['global_storage_result'] = global_result
         result['operations_performed'].append('globalStorage')
 
@@ -484,11 +905,12 @@ def clean_storage_comprehensive(editor_type: str = "VSCodium",
                 result['backup_paths'].append(global_result['backup_path'])
         else:
             result['overall_success'] = False
+            if global_result.get('pending_reboot'):
+                result['pending_reboot'] = True
 
-    # Clean workspaceStorage if requested
+    # Collect workspaceStorage results
     if clean_workspace:
-        print("💾 Cleaning workspaceStorage...")
-        workspace_result = clean_workspace_storage(editor_type, workspace_storage_path)
+        workspace_result = _cleaner_outcome(workspace_future, "workspaceStorage")
         result['workspace_storage_result'] = workspace_result
         result['operations_performed'].append('workspaceStorage')
 
@@ -498,12 +920,18 @@ def clean_storage_comprehensive(editor_type: str = "VSCodium",
                 result['backup_paths'].append(workspace_result['backup_path'])
         else:
             result['overall_success'] = False
+            if workspace_result.get('pending_reboot'):
+                result['pending_reboot'] = True
 
     # Summary
     operations_text = " and ".join(result['operations_performed'])
     if result['overall_success']:
         print(f"✅ Successfully cleaned {operations_text}")
         result['message'] = f"Successfully cleaned {operations_text}. Total files deleted: {result['total_files_deleted']}"
+    elif result['pending_reboot']:
+        print(f"⏳ Partially cleaned {operations_text}; locked files will be deleted on next reboot")
+        result['message'] = (f"Partially cleaned {operations_text}. Some files are locked by the IDE "
+                             f"and will only be deleted after the next restart.")
     else:
         print(f"⚠️ Partially cleaned {operations_text}")
         result['message'] = f"Partially cleaned {operations_text}. Some operations may have failed."
@@ -6,8 +6,8 @@ This module creates and runs the pywebview application with the web interface.
 
 import os
 import sys
-import webview
 from pathlib import Path
+from types import MappingProxyType
 
 try:
     # Try relative import first (for development)
@@ -16,20 +16,31 @@ except ImportError:
     # Fall back to absolute import (for packaged executable)
     from augment_free.api.core import AugmentFreeAPI
 
-# Windows-specific imports for icon setting
-if sys.platform == "win32":
-    try:
-        import ctypes
-    except ImportError:
-        ctypes = None
+# PyInstaller bundle state, fixed for the life of the process
+_IS_FROZEN = getattr(sys, "frozen", False)
+_MEIPASS = Path(sys._MEIPASS) if _IS_FROZEN else None
+
+# Static pywebview window options; main() adds the url and js_api
+_WINDOW_KWARGS = MappingProxyType({
+    "title": "Augment-Code-Free",
+    "width": 1000,
+    "height": 700,
+    "min_size": (800, 600),
+    "resizable": True,
+    "shadow": True,
+    "on_top": False,
+})
+
+# get_icon_path() result; _UNSET until the first lookup (None means no icon)
+_UNSET = object()
+_icon_path_cache = _UNSET
 
 
 def get_web_dir() -> str:
     """Get the web directory path."""
-    if getattr(sys, "frozen", False):
+    if _IS_FROZEN:
         # Running as PyInstaller bundle
-        base_path = Path(sys._MEIPASS)
-        web_dir = base_path / "web"
+        web_dir = _MEIPASS / "web"
     else:
         # Running in development
         current_dir = Path(__file__).parent
@@ -41,18 +52,23 @@ def get_icon_path() -> str | None:
     """
     Get the application icon path.
     Works both in development and when packaged with PyInstaller.
+    The result is cached, so later calls do not touch the filesystem.
     """
-    if getattr(sys, "frozen", False):
+    global _icon_path_cache
+    if _icon_path_cache is not _UNSET:
+        return _icon_path_cache
+
+    if _IS_FROZEN:
         # Running as PyInstaller bundle
-        base_path = Path(sys._MEIPASS)
-        icon_path = base_path / "app.ico"
+        icon_path = _MEIPASS / "app.ico"
     else:
         # Running in development - icon is in project root
         project_root = Path(__file__).parent.parent.parent
         icon_path = project_root / "app.ico"
 
     # Return path if file exists, otherwise return None
-    return str(icon_path) if icon_path.exists() else None
+    _icon_path_cache = str(icon_path) if icon_path.exists() else None
+    return _icon_path_cache
 
 
 def set_windows_icon(icon_path: str) -> None:
@@ -60,21 +76,30 @@ def set_windows_icon(icon_path: str) -> None:
     Set application icon on Windows using Win32 API.
     This is called after the window is created.
     """
-    if sys.platform != "win32" or not ctypes:
+    if sys.platform != "win32":
         return
 
     try:
-        # Wait for window to be created
+        import ctypes
         import time
-        time.sleep(0.5)
 
-        # Get the window handle
-        hwnd = ctypes.windll.user32.GetForegroundWindow()
+        # Find the window by its title; the loaded event means it exists, so
+        # only poll briefly in case the native handle is not registered yet
+        user32 = ctypes.windll.user32
+        title = _WINDOW_KWARGS["title"]
+        hwnd = user32.FindWindowW(None, title)
+        for _ in range(20):
+            if hwnd:
+                break
+            time.sleep(0.01)
+            hwnd = user32.FindWindowW(None, title)
+        if not hwnd:
+            hwnd = user32.GetForegroundWindow()
         if hwnd == 0:
             return
 
         # Load the icon
-        hicon = ctypes.windll.user32.LoadImageW(
+        hicon = user32.LoadImageW(
             None,  # hInst
             icon_path,  # name
             1,  # IMAGE_ICON
@@ -85,8 +110,8 @@ def set_windows_icon(icon_path: str) -> None:
 
         if hicon != 0:
             # Set both small and large icons
-            ctypes.windll.user32.SendMessageW(hwnd, 0x0080, 0, hicon)  # WM_SETICON, ICON_SMALL
-            ctypes.windll.user32.SendMessageW(hwnd, 0x0080, 1, hicon)  # WM_SETICON, ICON_LARGE
+            user32.SendMessageW(hwnd, 0x0080, 0, hicon)  # WM_SETICON, ICON_SMALL
+            user32.SendMessageW(hwnd, 0x0080, 1, hicon)  # WM_SETICON, ICON_LARGE
             print("✅ Successfully set Windows icon")
         else:
             print(f"❌ Failed to load icon: {icon_path}")
@@ -120,9 +145,9 @@ def main():
             print(f"🔐 Administrator: ❓ Unknown")
 
         # Check if running as PyInstaller bundle
-        if getattr(sys, "frozen", False):
+        if _IS_FROZEN:
             print(f"📦 Mode: PyInstaller bundle")
-            print(f"📁 Bundle path: {sys._MEIPASS}")
+            print(f"📁 Bundle path: {_MEIPASS}")
         else:
             print("📦 Mode: Development")
 
@@ -135,83 +160,61 @@ def main():
         # Get web directory
         print("Locating web files...")
         web_dir = get_web_dir()
-        index_path = os.path.join(web_dir, "index.html")
 
-        print(f"Web directory: {web_dir}")
-        print(f"Index path: {index_path}")
-
-        # Check if web files exist
-        if not os.path.exists(index_path):
-            print(f"ERROR: Web files not found at {index_path}")
+        # Try the expected layout first, then the nested augment_free/web layout
+        # some PyInstaller bundles use; only list directories if both are missing
+        candidates = [os.path.join(web_dir, "index.html")]
+        if _IS_FROZEN:
+            candidates.append(os.path.join(_MEIPASS, "augment_free", "web", "index.html"))
+
+        for candidate in candidates:
+            try:
+                os.stat(candidate)
+            except OSError:
+                continue
+            index_path = candidate
+            web_dir = os.path.dirname(candidate)
+            break
+        else:
+            print(f"ERROR: Web files not found at {candidates[0]}")
             print("Please ensure the web directory contains index.html")
 
-            # List what's actually in the directory
-            if os.path.exists(web_dir):
-                print(f"Contents of {web_dir}:")
-                for item in os.listdir(web_dir):
+            # List what's actually in the candidate directories
+            search_dirs = [web_dir]
+            if _IS_FROZEN:
+                search_dirs += [_MEIPASS, os.path.join(_MEIPASS, "augment_free")]
+            for search_dir in search_dirs:
+                try:
+                    items = os.listdir(search_dir)
+                except OSError:
+                    print(f"Directory {search_dir} does not exist")
+                    continue
+                print(f"Contents of {search_dir}:")
+                for item in items:
                     print(f"  - {item}")
-            else:
-                print(f"Web directory {web_dir} does not exist")
-
-                # If running as PyInstaller bundle, check what's in _MEIPASS
-                if getattr(sys, "frozen", False):
-                    print(f"Contents of {sys._MEIPASS}:")
-                    for item in os.listdir(sys._MEIPASS):
-                        print(f"  - {item}")
-
-                    # Try to find web files in augment_free subdirectory
-                    augment_free_dir = os.path.join(sys._MEIPASS, "augment_free")
-                    if os.path.exists(augment_free_dir):
-                        print(f"Contents of {augment_free_dir}:")
-                        for item in os.listdir(augment_free_dir):
-                            print(f"  - {item}")
-
-                        # Check if web files are in augment_free/web
-                        web_in_augment = os.path.join(augment_free_dir, "web")
-                        if os.path.exists(web_in_augment):
-                            print(f"Found web directory at: {web_in_augment}")
-                            index_in_augment = os.path.join(web_in_augment, "index.html")
-                            if os.path.exists(index_in_augment):
-                                print("Found index.html! Using this path instead.")
-                                web_dir = web_in_augment
-                                index_path = index_in_augment
-                            else:
-                                print("Web directory found but no index.html")
-                                input("Press Enter to exit...")
-                                sys.exit(1)
-                        else:
-                            print("No web directory found in augment_free")
-                            input("Press Enter to exit...")
-                            sys.exit(1)
-                    else:
-                        print("No augment_free directory found")
-                        input("Press Enter to exit...")
-                        sys.exit(1)
-                else:
-                    input("Press Enter to exit...")
-                    sys.exit(1)
+
+            input("Press Enter to exit...")
+            sys.exit(1)
+
+        print(f"Web directory: {web_dir}")
+        print(f"Index path: {index_path}")
 
         # Get icon path
         print("Locating icon...")
-        icon_path = get_icon_path()
+        try:
+            icon_path = get_icon_path()
+        except Exception:
+            icon_path = None
         if icon_path:
             print(f"Icon path: {icon_path}")
         else:
             print("No icon found")
 
-        # Create webview window
+        # Create webview window (imported only now so a missing web dir fails fast)
         print("Creating webview window...")
-        window_kwargs = {
-            "title": "Augment-Code-Free",
-            "url": index_path,
-            "js_api": api,
-            "width": 1000,
-            "height": 700,
-            "min_size": (800, 600),
-            "resizable": True,
-            "shadow": True,
-            "on_top": False,
-        }
+        import webview
+
+        window_kwargs = {**_WINDOW_KWARGS, "url": index_path, "js_api": api}
 
         # Print icon path if available (icon will be set via webview.start())
         if icon_path:
@@ -247,7 +250,7 @@ def main():
             traceback.print_exc()
 
             # If running as executable, keep console open
-            if getattr(sys, "frozen", False):
+            if _IS_FROZEN:
                 input("Press Enter to exit...")
 
             sys.exit(1)
@@ -258,7 +261,7 @@ def main():
         traceback.print_exc()
 
         # If running as executable, keep console open
-        if getattr(sys, "frozen", False):
+        if _IS_FROZEN:
             input("Press Enter to exit...")
 
         sys.exit(1)
@@ -6,20 +6,154 @@ Supports VSCode variants and JetBrains IDEs.
 """
 
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import List, Dict, Any
 import json
+import tempfile
+
+from .paths import fold_name
+
+
+@lru_cache(maxsize=None)
+def _candidate_directories() -> tuple:
+    """
+    Directories where IDEs might store configuration, before existence checks.
+
+    Resolved on first use and then cached for the process. Path.home() raises
+    RuntimeError when no home directory can be determined; computing this
+    lazily keeps that inside the callers' error handling instead of failing
+    the import.
+    """
+    home = Path.home()
+
+    if sys.platform == "win32":
+        # Windows
+        dirs = [Path(value) for value in (os.getenv("APPDATA"), os.getenv("LOCALAPPDATA")) if value]
+    elif sys.platform == "darwin":
+        # macOS
+        dirs = [
+            home / "Library" / "Application Support",
+            home / "Library" / "Preferences",
+            home / ".config"
+        ]
+    else:
+        # Linux and other Unix-like systems
+        dirs = [
+            home / ".config",
+            home / ".local" / "share",
+            home / ".cache"
+        ]
+
+    # Add home directory as fallback
+    dirs.append(home)
+    return tuple(dirs)
+
+
+# JetBrains version sources: the directory name (e.g. "IntelliJIdea2023.1"),
+# then the head of a few options files known to carry a version attribute
+_JB_DIRNAME_VERSION_RE = re.compile(r'(\d{4}\.\d+)')
+_JB_XML_VERSION_RE = re.compile(rb'version="([^"]+)"')
+_JB_VERSION_FILES = ("other.xml", "ide.general.xml", "options.xml")
+_JB_VERSION_READ_BYTES = 4096
+
+# On-disk cache of the last detect_ides() result. It is reused while every
+# directory the detection looked at still has the same mtime (or is still
+# missing); creating, removing or renaming entries in any of them invalidates it
+_IDE_CACHE_VERSION = 2
+
+
+@lru_cache(maxsize=None)
+def _ide_cache_file() -> Path:
+    """Location of the detection cache, resolved on first use."""
+    return Path.home() / ".augment_free" / "ide_cache.json"
+
+
+def _dir_mtimes(paths) -> Dict[str, Any]:
+    """Map each path to its mtime in nanoseconds, or None if it does not exist."""
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            mtimes[path] = None
+    return mtimes
+
+
+def _cache_key() -> Dict[str, Any]:
+    """Identify the environment a cached result was computed for."""
+    return {
+        "version": _IDE_CACHE_VERSION,
+        "platform": sys.platform,
+        "candidates": [str(d) for d in _candidate_directories()],
+    }
+
+
+def _load_ide_cache() -> List[Dict[str, Any]]:
+    """Return the cached IDE list if it is still valid, otherwise None."""
+    try:
+        with open(_ide_cache_file(), 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get("key") != _cache_key():
+            return None
+        watched = cache["mtimes"]
+        if _dir_mtimes(watched) != watched:
+            return None
+        return cache["ides"]
+    except Exception:
+        return None
+
+
+def _save_ide_cache(ides: List[Dict[str, Any]], watched_mtimes: Dict[str, Any]) -> None:
+    """
+    Persist a detection result with the mtimes of the directories it depends on.
+
+    watched_mtimes must have been taken before each directory was scanned, so
+    a change made during the scan makes the saved entry stale, not current.
+    """
+    try:
+        cache = {"key": _cache_key(), "mtimes": dict(sorted(watched_mtimes.items())), "ides": ides}
+        # A unique temp file per writer: detect_ides() may run on two threads
+        cache_file = _ide_cache_file()
+        fd, tmp_file = tempfile.mkstemp(dir=cache_file.parent, prefix="ide_cache.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False)
+            os.replace(tmp_file, cache_file)
+        except BaseException:
+            os.unlink(tmp_file)
+            raise
+    except Exception:
+        # The cache is only an optimization; detection still works without it
+        pass
+
+
+@lru_cache(maxsize=32)
+def _read_product_version(product_json: str, mtime_ns: int) -> str:
+    """Read the version from a product.json; cached until the file's mtime changes."""
+    with open(product_json, 'r', encoding='utf-8') as f:
+        return json.load(f).get('version', 'Unknown')
 
 
 class IDEInfo:
     """Information about a detected IDE."""
 
-    def __init__(self, name: str, display_name: str, ide_type: str, config_path: str, icon: str = "📝", version: str = None, executable_path: str = None):
+    # One instance per detected IDE; slots avoid a per-instance __dict__
+    __slots__ = (
+        "name", "display_name", "ide_type", "config_path", "icon", "version",
+        "executable_path", "storage_path", "db_path", "machine_id_path",
+        "workspace_storage_path", "global_storage_path",
+        "permanent_device_id_path", "permanent_user_id_path",
+    )
+
+    def __init__(self, name: str, display_name: str, ide_type: str, config_path: str | Path, icon: str = "📝", version: str = None, executable_path: str = None):
         self.name = name  # Internal name (e.g., "Code", "VSCodium")
         self.display_name = display_name  # Display name (e.g., "VS Code", "VSCodium")
         self.ide_type = ide_type  # "vscode" or "jetbrains"
-        self.config_path = config_path  # Configuration directory path
+        self.config_path = config_path  # Configuration directory (Path once detected)
         self.icon = icon  # Emoji icon for display
         self.version = version  # IDE version if available
         self.executable_path = executable_path  # Path to executable if found
@@ -39,7 +173,7 @@ class IDEInfo:
             "name": self.name,
             "display_name": self.display_name,
             "ide_type": self.ide_type,
-            "config_path": self.config_path,
+            "config_path": os.fspath(self.config_path) if self.config_path is not None else None,
             "icon": self.icon,
             "version": self.version,
             "executable_path": self.executable_path,
@@ -56,145 +190,199 @@ class IDEInfo:
 class IDEDetector:
     """Cross-platform IDE detector."""
 
+    # Known VSCode variant names and their display info
+    KNOWN_VSCODE_VARIANTS = {
+        "Code": {"display": "VS Code", "icon": "💙"},
+        "Code - Insiders": {"display": "VS Code Insiders", "icon": "💙"},
+        "VSCodium": {"display": "VSCodium", "icon": "🔷"},
+        "Cursor": {"display": "Cursor", "icon": "🎯"},
+        "Code - OSS": {"display": "Code - OSS", "icon": "🔶"},
+        "code-oss": {"display": "Code - OSS", "icon": "🔶"},
+        "Codium": {"display": "Codium", "icon": "🔷"},
+        "code": {"display": "Code", "icon": "💙"},
+    }
+
+    # Known JetBrains IDE patterns
+    JETBRAINS_PATTERNS = {
+        "IntelliJIdea": {"display": "IntelliJ IDEA", "icon": "🧠"},
+        "PyCharm": {"display": "PyCharm", "icon": "🐍"},
+        "WebStorm": {"display": "WebStorm", "icon": "🚀"},
+        "PhpStorm": {"display": "PhpStorm", "icon": "🐘"},
+        "RubyMine": {"display": "RubyMine", "icon": "💎"},
+        "CLion": {"display": "CLion", "icon": "⚙️"},
+        "DataGrip": {"display": "DataGrip", "icon": "🗄️"},
+        "GoLand": {"display": "GoLand", "icon": "🐹"},
+        "Rider": {"display": "Rider", "icon": "🏇"},
+        "AndroidStudio": {"display": "Android Studio", "icon": "🤖"},
+    }
+
+    # Case-insensitive lookup tables, built once per process. When two variants
+    # differ only by case ("Code" / "code") the first one listed wins, as it
+    # did with the old linear scan.
+    _VSCODE_LOWER = {sys.intern(name.lower()): (name, info)
+                     for name, info in reversed(KNOWN_VSCODE_VARIANTS.items())}
+    # Entries whose presence marks a JetBrains configuration directory
+    # (folded like listing names, so case is ignored where the file system ignores it)
+    _JETBRAINS_INDICATORS = frozenset(map(fold_name, ("options", "config", "system", "plugins")))
+    # JetBrains config dirs start with the product name ("PyCharm2023.2"); one
+    # anchored alternation, longest name first, finds it in a single match
+    _JETBRAINS_RE = re.compile(
+        "|".join(map(re.escape, sorted(JETBRAINS_PATTERNS, key=len, reverse=True))),
+        re.IGNORECASE)
+    _JETBRAINS_LOWER = {sys.intern(pattern.lower()): info
+                        for pattern, info in JETBRAINS_PATTERNS.items()}
+
     def __init__(self):
         self.detected_ides: List[IDEInfo] = []
-
-    def _verify_ide_paths(self, ide_info: IDEInfo) -> None:
-        """Verify and find actual paths for IDE files and directories."""
-        if not ide_info.config_path or not Path(ide_info.config_path).exists():
+        # Directories whose contents decided the detection result, mapped to
+        # their mtime (or None) as seen just before they were scanned
+        self.watched_mtimes: Dict[str, Any] = {}
+
+    def _watch(self, paths) -> None:
+        """Record the current mtime of each path not already watched."""
+        new_paths = [path for path in paths if path not in self.watched_mtimes]
+        self.watched_mtimes.update(_dir_mtimes(new_paths))
+
+    @staticmethod
+    def _list_dir(path: str) -> Dict[str, os.DirEntry]:
+        """List a directory as {fold_name(name): DirEntry}, or None if it cannot be read."""
+        try:
+            with os.scandir(path) as it:
+                return {fold_name(entry.name): entry for entry in it}
+        except OSError:
+            return None
+
+    def _verify_ide_paths(self, ide_info: IDEInfo, config_path: str) -> None:
+        """
+        Verify and find actual paths for IDE files and directories.
+
+        config_path is the directory the detector just matched, passed in so
+        it is not re-checked; one listing per level replaces a stat per file.
+        """
+        config_entries = self._list_dir(config_path)
+        if config_entries is None:
             return
 
-        config_path = Path(ide_info.config_path)
-
         if ide_info.ide_type == 'jetbrains':
             # JetBrains IDE paths
-            device_id_file = config_path / "PermanentDeviceId"
-            user_id_file = config_path / "PermanentUserId"
+            device_id_file = config_entries.get(fold_name("PermanentDeviceId"))
+            user_id_file = config_entries.get(fold_name("PermanentUserId"))
 
-            if device_id_file.exists():
-                ide_info.permanent_device_id_path = str(device_id_file)
-            if user_id_file.exists():
-                ide_info.permanent_user_id_path = str(user_id_file)
+            if device_id_file is not None:
+                ide_info.permanent_device_id_path = device_id_file.path
+            if user_id_file is not None:
+                ide_info.permanent_user_id_path = user_id_file.path
 
         else:
             # VSCode series paths
-            user_dir = config_path / "User"
-            if user_dir.exists():
+            user_dir = config_entries.get(fold_name("User"))
+            user_entries = self._list_dir(user_dir.path) if user_dir is not None else None
+            if user_entries is not None:
                 # Look for globalStorage directory
-                global_storage = user_dir / "globalStorage"
-                if global_storage.exists():
+                global_storage = user_entries.get(fold_name("globalStorage"))
+                if global_storage is not None:
                     # Set the globalStorage directory path
-                    ide_info.global_storage_path = str(global_storage)
+                    ide_info.global_storage_path = global_storage.path
+                    global_entries = self._list_dir(global_storage.path) or {}
 
                     # Check for storage.json
-                    storage_file = global_storage / "storage.json"
-                    if storage_file.exists():
-                        ide_info.storage_path = str(storage_file)
+                    storage_file = global_entries.get(fold_name("storage.json"))
+                    if storage_file is not None:
+                        ide_info.storage_path = storage_file.path
 
                     # Check for state.vscdb
-                    db_file = global_storage / "state.vscdb"
-                    if db_file.exists():
-                        ide_info.db_path = str(db_file)
+                    db_file = global_entries.get(fold_name("state.vscdb"))
+                    if db_file is not None:
+                        ide_info.db_path = db_file.path
 
                 # Check for machineid file
-                machine_id_file = user_dir / "machineid"
-                if machine_id_file.exists():
-                    ide_info.machine_id_path = str(machine_id_file)
+                machine_id_file = user_entries.get(fold_name("machineid"))
+                if machine_id_file is not None:
+                    ide_info.machine_id_path = machine_id_file.path
 
                 # Check for workspaceStorage directory
-                workspace_storage_dir = user_dir / "workspaceStorage"
-                if workspace_storage_dir.exists():
-                    ide_info.workspace_storage_path = str(workspace_storage_dir)
+                workspace_storage_dir = user_entries.get(fold_name("workspaceStorage"))
+                if workspace_storage_dir is not None:
+                    ide_info.workspace_storage_path = workspace_storage_dir.path
 
             # Also check for machineid in root config directory (some versions)
-            root_machine_id = config_path / "machineid"
-            if root_machine_id.exists() and not ide_info.machine_id_path:
-                ide_info.machine_id_path = str(root_machine_id)
+            root_machine_id = config_entries.get(fold_name("machineid"))
+            if root_machine_id is not None and not ide_info.machine_id_path:
+                ide_info.machine_id_path = root_machine_id.path
+
+    @cached_property
+    def standard_directories(self) -> List[Path]:
+        """Standard directories that exist, computed once per detector."""
+        # os.path.isdir is a single stat and also drops non-directory entries
+        return [d for d in _candidate_directories() if os.path.isdir(d)]
 
     def get_standard_directories(self) -> List[Path]:
         """Get standard directories where IDEs might store configuration."""
-        dirs = []
-
-        if sys.platform == "win32":
-            # Windows
-            if appdata := os.getenv("APPDATA"):
-                dirs.append(Path(appdata))
-            if localappdata := os.getenv("LOCALAPPDATA"):
-                dirs.append(Path(localappdata))
-        elif sys.platform == "darwin":
-            # macOS
-            home = Path.home()
-            dirs.extend([
-                home / "Library" / "Application Support",
-                home / "Library" / "Preferences",
-                home / ".config"
-            ])
-        else:
-            # Linux and other Unix-like systems
-            home = Path.home()
-            dirs.extend([
-                home / ".config",
-                home / ".local" / "share",
-                home / ".cache"
-            ])
-
-        # Add home directory as fallback
-        dirs.append(Path.home())
+        return self.standard_directories
 
-        return [d for d in dirs if d.exists()]
+    def _undetected_variant_keys(self, seen: set) -> set:
+        """Lowercase variant names whose display name has not been detected yet."""
+        return {key for key, (_, info) in self._VSCODE_LOWER.items() if info["display"] not in seen}
 
     def detect_vscode_variants(self) -> List[IDEInfo]:
         """Detect VSCode and its variants."""
         vscode_variants = []
+        # Display names already detected; detect_all_ides keeps only the first
+        # IDE per display name, so later matches are skipped before any stat
+        seen = set()
 
-        # Known VSCode variant names and their display info
-        known_variants = {
-            "Code": {"display": "VS Code", "icon": "💙"},
-            "Code - Insiders": {"display": "VS Code Insiders", "icon": "💙"},
-            "VSCodium": {"display": "VSCodium", "icon": "🔷"},
-            "Cursor": {"display": "Cursor", "icon": "🎯"},
-            "Code - OSS": {"display": "Code - OSS", "icon": "🔶"},
-            "code-oss": {"display": "Code - OSS", "icon": "🔶"},
-            "Codium": {"display": "Codium", "icon": "🔷"},
-            "code": {"display": "Code", "icon": "💙"},
-        }
-
-        base_dirs = self.get_standard_directories()
+        base_dirs = self.standard_directories
 
         for base_dir in base_dirs:
-            try:
-                # Scan for directories that might be VSCode variants
-                for item in base_dir.iterdir():
-                    if not item.is_dir():
-                        continue
+            # Variant names that could still add a new IDE; once every display
+            # name is found, neither this nor any later base dir can add more
+            remaining = self._undetected_variant_keys(seen)
+            if not remaining:
+                break
 
-                    item_name = item.name
-
-                    # Check if this looks like a VSCode variant
-                    for variant_name, variant_info in known_variants.items():
-                        if item_name == variant_name or item_name.lower() == variant_name.lower():
-                            # Check if it has the expected VSCode structure
-                            user_dir = item / "User"
-                            global_storage = user_dir / "globalStorage"
-
-                            if user_dir.exists() and global_storage.exists():
-                                # Try to get version information
-                                version = self._get_vscode_version(item)
-
-                                ide_info = IDEInfo(
-                                    name=variant_name,
-                                    display_name=variant_info["display"],
-                                    ide_type="vscode",
-                                    config_path=str(item),
-                                    icon=variant_info["icon"],
-                                    version=version
-                                )
-
-                                # Verify and find actual paths
-                                self._verify_ide_paths(ide_info)
-
-                                vscode_variants.append(ide_info)
-                                break
+            try:
+                # Scan for directories that might be VSCode variants. The name
+                # lookup rejects almost every entry, so it runs before is_dir(),
+                # which may need a stat for symlinks or unknown entry types
+                with os.scandir(base_dir) as it:
+                    for entry in it:
+                        key = entry.name.lower()
+                        if key not in remaining or not entry.is_dir():
+                            continue
+                        variant_name, variant_info = self._VSCODE_LOWER[key]
+                        user_dir = os.path.join(entry.path, "User")
+                        self._watch(
+                            (entry.path, user_dir, os.path.join(user_dir, "globalStorage")))
+
+                        # Check if it has the expected VSCode structure;
+                        # one stat covers both User and User/globalStorage
+                        try:
+                            os.stat(os.path.join(entry.path, "User", "globalStorage"))
+                        except OSError:
+                            continue
+
+                        # Try to get version information
+                        config_path = Path(entry.path)
+                        version = self._get_vscode_version(config_path)
+
+                        ide_info = IDEInfo(
+                            name=variant_name,
+                            display_name=variant_info["display"],
+                            ide_type="vscode",
+                            config_path=config_path,
+                            icon=variant_info["icon"],
+                            version=version
+                        )
+
+                        # Verify and find actual paths
+                        self._verify_ide_paths(ide_info, entry.path)
+
+                        vscode_variants.append(ide_info)
+                        seen.add(ide_info.display_name)
+
+                        remaining = self._undetected_variant_keys(seen)
+                        if not remaining:
+                            break
             except (PermissionError, OSError):
                 # Skip directories we can't access
                 continue
@@ -204,90 +392,73 @@ class IDEDetector:
     def detect_jetbrains_ides(self) -> List[IDEInfo]:
         """Detect JetBrains IDEs."""
         jetbrains_ides = []
+        seen = set()  # Display names already detected, as in detect_vscode_variants
 
-        # Known JetBrains IDE patterns
-        jetbrains_patterns = {
-            "IntelliJIdea": {"display": "IntelliJ IDEA", "icon": "🧠"},
-            "PyCharm": {"display": "PyCharm", "icon": "🐍"},
-            "WebStorm": {"display": "WebStorm", "icon": "🚀"},
-            "PhpStorm": {"display": "PhpStorm", "icon": "🐘"},
-            "RubyMine": {"display": "RubyMine", "icon": "💎"},
-            "CLion": {"display": "CLion", "icon": "⚙️"},
-            "DataGrip": {"display": "DataGrip", "icon": "🗄️"},
-            "GoLand": {"display": "GoLand", "icon": "🐹"},
-            "Rider": {"display": "Rider", "icon": "🏇"},
-            "AndroidStudio": {"display": "Android Studio", "icon": "🤖"},
-        }
-
-        base_dirs = self.get_standard_directories()
+        base_dirs = self.standard_directories
 
         for base_dir in base_dirs:
-            jetbrains_dir = base_dir / "JetBrains"
-            if not jetbrains_dir.exists():
-                continue
+            # A missing JetBrains dir surfaces as FileNotFoundError from scandir
+            jetbrains_dir = os.path.join(base_dir, "JetBrains")
 
             try:
-                for item in jetbrains_dir.iterdir():
-                    if not item.is_dir():
-                        continue
+                with os.scandir(jetbrains_dir) as it:
+                    matches = [(entry, match) for entry in it
+                               if (match := self._JETBRAINS_RE.match(entry.name)) is not None
+                               and entry.is_dir()]
 
-                    item_name = item.name
+                for entry, match in matches:
+                    item_name = entry.name
 
                     # Check for JetBrains IDE patterns
-                    for pattern, info in jetbrains_patterns.items():
-                        if pattern.lower() in item_name.lower():
-                            # Verify it's a valid JetBrains IDE directory
-                            if self._is_valid_jetbrains_dir(item):
-                                # Try to get version information
-                                version = self._get_jetbrains_version(item)
-
-                                ide_info = IDEInfo(
-                                    name=item_name,
-                                    display_name=info["display"],
-                                    ide_type="jetbrains",
-                                    config_path=str(item),
-                                    icon=info["icon"],
-                                    version=version
-                                )
-
-                                # Verify and find actual paths
-                                self._verify_ide_paths(ide_info)
-
-                                jetbrains_ides.append(ide_info)
-                                break
+                    info = self._JETBRAINS_LOWER[match.group().lower()]
+                    if info["display"] in seen:
+                        continue
+                    self._watch(
+                        (entry.path, os.path.join(entry.path, "options")))
+
+                    # Verify it's a valid JetBrains IDE directory
+                    if not self._is_valid_jetbrains_dir(entry.path):
+                        continue
+
+                    # Try to get version information
+                    config_path = Path(entry.path)
+                    version = self._get_jetbrains_version(config_path)
+
+                    ide_info = IDEInfo(
+                        name=item_name,
+                        display_name=info["display"],
+                        ide_type="jetbrains",
+                        config_path=config_path,
+                        icon=info["icon"],
+                        version=version
+                    )
+
+                    # Verify and find actual paths
+                    self._verify_ide_paths(ide_info, entry.path)
+
+                    jetbrains_ides.append(ide_info)
+                    seen.add(ide_info.display_name)
             except (PermissionError, OSError):
                 continue
 
         return jetbrains_ides
 
-    def _is_valid_jetbrains_dir(self, path: Path) -> bool:
+    def _is_valid_jetbrains_dir(self, path: str) -> bool:
         """Check if a directory is a valid JetBrains IDE configuration directory."""
-        # Look for common JetBrains configuration files/directories
-        indicators = ["options", "config", "system", "plugins"]
-        return any((path / indicator).exists() for indicator in indicators)
+        # Look for common JetBrains configuration files/directories in one listing
+        try:
+            with os.scandir(path) as it:
+                return any(fold_name(entry.name) in self._JETBRAINS_INDICATORS for entry in it)
+        except OSError:
+            return False
 
     def _get_vscode_version(self, config_path: Path) -> str:
         """Try to get VSCode version from configuration."""
         try:
-            # Try to read from product.json or other version files
-            product_json = config_path / "product.json"
-            if product_json.exists():
-                with open(product_json, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return data.get('version', 'Unknown')
-
-            # Try to read from User/settings.json or other files
-            user_dir = config_path / "User"
-            if user_dir.exists():
-                # Look for any version indicators in the user directory
-                for file in user_dir.glob("*.json"):
-                    try:
-                        with open(file, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            if 'version' in data:
-                                return data['version']
-                    except:
-                        continue
+            # product.json is the only file that carries the version; the
+            # user settings files never do, so they are not parsed
+            product_json = os.path.join(config_path, "product.json")
+            return _read_product_version(product_json, os.stat(product_json).st_mtime_ns)
         except:
             pass
         return None
@@ -296,59 +467,45 @@ class IDEDetector:
         """Try to get JetBrains IDE version from configuration."""
         try:
             # JetBrains IDEs often have version info in the directory name
-            dir_name = config_path.name
-            # Extract version from directory name like "IntelliJIdea2023.1"
-            import re
-            version_match = re.search(r'(\d{4}\.\d+)', dir_name)
+            version_match = _JB_DIRNAME_VERSION_RE.search(config_path.name)
             if version_match:
                 return version_match.group(1)
 
-            # Try to read from options or config files
+            # Try the options files that carry a version; it sits near the top
             options_dir = config_path / "options"
-            if options_dir.exists():
-                for file in options_dir.glob("*.xml"):
-                    try:
-                        with open(file, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                            version_match = re.search(r'version="([^"]+)"', content)
-                            if version_match:
-                                return version_match.group(1)
-                    except:
-                        continue
+            for name in _JB_VERSION_FILES:
+                try:
+                    with open(options_dir / name, 'rb') as f:
+                        head = f.read(_JB_VERSION_READ_BYTES)
+                except OSError:
+                    continue
+                version_match = _JB_XML_VERSION_RE.search(head)
+                if version_match:
+                    return version_match.group(1).decode('utf-8', 'replace')
         except:
             pass
         return None
 
     def detect_all_ides(self) -> List[IDEInfo]:
         """Detect all supported IDEs."""
-        all_ides = []
-
-        # Detect VSCode variants
-        all_ides.extend(self.detect_vscode_variants())
-
-        # Detect JetBrains IDEs
-        all_ides.extend(self.detect_jetbrains_ides())
-
-        # Remove duplicates based on config path and display name
-        seen_items = set()
-        unique_ides = []
+        # Resolve the shared base dirs before the detectors run side by side
+        self._watch([str(d) for d in _candidate_directories()])
+        self._watch([os.path.join(d, "JetBrains") for d in self.standard_directories])
+
+        # Detect VSCode variants and JetBrains IDEs concurrently; both are
+        # bound by filesystem calls and scan different subdirectories
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            vscode_future = executor.submit(self.detect_vscode_variants)
+            jetbrains_future = executor.submit(self.detect_jetbrains_ides)
+            all_ides = vscode_future.result() + jetbrains_future.result()
+
+        # 强力去重机制：基于display_name去重，保留第一个检测到的IDE
+        by_display_name: Dict[str, IDEInfo] = {}
         for ide in all_ides:
-            # Create a unique key combining path and display name
-            unique_key = f"{ide.config_path}|{ide.display_name}"
-            if unique_key not in seen_items:
-                seen_items.add(unique_key)
-                unique_ides.append(ide)
-
-        # 强力去重机制：基于display_name进行最终过滤
-        final_unique_ides = []
-        seen_display_names = set()
-        for ide in unique_ides:
-            if ide.display_name not in seen_display_names:
-                seen_display_names.add(ide.display_name)
-                final_unique_ides.append(ide)
+            by_display_name.setdefault(ide.display_name, ide)
 
         # Sort by IDE type and name
-        final_unique_ides.sort(key=lambda x: (x.ide_type, x.display_name))
+        final_unique_ides = sorted(by_display_name.values(), key=lambda x: (x.ide_type, x.display_name))
 
         self.detected_ides = final_unique_ides
         return final_unique_ides
@@ -361,22 +518,35 @@ class IDEDetector:
         ]
 
 
-def detect_ides() -> Dict[str, Any]:
+def detect_ides(use_cache: bool = True) -> Dict[str, Any]:
     """
     Main function to detect IDEs.
 
+    Args:
+        use_cache: Reuse the on-disk result while the scanned directories are unchanged;
+            pass False to force a fresh scan (the result is still saved)
+
     Returns:
         dict: Detection results with IDE list and summary
     """
     try:
-        detector = IDEDetector()
-        detected_ides = detector.detect_all_ides()
+        ides = _load_ide_cache() if use_cache else None
+        if ides is None:
+            # Create the cache dir before any mtime is taken: it may live in a
+            # watched directory (home), and creating it later would change that
+            try:
+                _ide_cache_file().parent.mkdir(exist_ok=True)
+            except OSError:
+                pass
+            detector = IDEDetector()
+            ides = [ide.to_dict() for ide in detector.detect_all_ides()]
+            _save_ide_cache(ides, detector.watched_mtimes)
 
         return {
             "success": True,
-            "ides": [ide.to_dict() for ide in detected_ides],
-            "count": len(detected_ides),
-            "message": f"检测到 {len(detected_ides)} 个IDE"
+            "ides": ides,
+            "count": len(ides),
+            "message": f"检测到 {len(ides)} 个IDE"
         }
     except Exception as e:
         return {
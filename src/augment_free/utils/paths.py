@@ -2,6 +2,23 @@ import os
 import sys
 from pathlib import Path
 
+# Windows and macOS file systems ignore case by default, so names taken from a
+# directory listing are compared lowercased there, as Path.exists() would match
+CASE_INSENSITIVE_FS = os.name == 'nt' or sys.platform == 'darwin'
+
+
+def fold_name(name: str) -> str:
+    """
+    Normalize a file name for comparing against directory listing entries.
+
+    Args:
+        name (str): File or directory name
+
+    Returns:
+        str: The name lowercased on case-insensitive platforms, otherwise unchanged
+    """
+    return name.lower() if CASE_INSENSITIVE_FS else name
+
 
 def get_home_dir() -> str:
     """
@@ -6,22 +6,160 @@ and handle session-related files that might prevent proper cleaning.
 """
 
 import os
-import json
+import stat
 import time
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+from .paths import fold_name
 
-def find_session_files(editor_type: str) -> List[Dict[str, Any]]:
+
+# Common session-related paths, as (parent directory parts, name) under the
+# editor's APPDATA directory. They live in three parents, each listed once.
+SESSION_ENTRIES = (
+    (("User", "globalStorage"), "storage.json"),
+    (("User", "globalStorage"), "state.vscdb"),
+    (("User",), "workspaceStorage"),
+    ((), "logs"),
+    ((), "CachedExtensions"),
+    ((), "CachedExtensionVSIXs"),
+    (("User",), "History"),
+)
+
+# find_session_files() results per editor type as (time.monotonic(), files).
+# Status polls within SESSION_CACHE_TTL seconds reuse the previous scan.
+SESSION_CACHE_TTL = 2.0
+_session_cache: Dict[str, tuple] = {}
+
+FILE_ATTRIBUTE_REPARSE_POINT = 0x400
+
+
+class SessionFileInfo:
+    """A session file or directory found by find_session_files()."""
+
+    __slots__ = ("path", "type", "kind", "size", "modified", "accessible", "error")
+
+    def __init__(self, path: str, type: str, kind: str, size: Optional[int] = None,
+                 modified: Optional[float] = None, accessible: bool = False, error: Optional[str] = None):
+        self.path = path
+        self.type = type  # "file", "directory", "symlink" or "unknown"
+        self.kind = kind  # Tag from _classify_session_entry(), or "unknown"
+        self.size = size  # None for directories
+        self.modified = modified
+        self.accessible = accessible
+        self.error = error  # Set when the entry could not be inspected
+
+    def copy(self) -> "SessionFileInfo":
+        """Return an independent copy of this entry."""
+        return SessionFileInfo(self.path, self.type, self.kind, self.size,
+                               self.modified, self.accessible, self.error)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        if self.error is not None:
+            return {
+                'path': self.path,
+                'type': self.type,
+                'kind': self.kind,
+                'error': self.error,
+                'accessible': self.accessible
+            }
+        return {
+            'path': self.path,
+            'type': self.type,
+            'kind': self.kind,
+            'size': self.size,
+            'modified': self.modified,
+            'accessible': self.accessible
+        }
+
+
+def _classify_session_entry(name: str, is_dir: bool, is_link: bool = False) -> str:
+    """Tag a session entry with how clear_session_data() should treat it."""
+    if is_link:
+        # Neither clear through a link nor delete the user's link itself
+        return "unknown"
+    if name == "workspaceStorage":
+        # Workspace storage is handled separately
+        return "workspace_skip"
+    if is_dir:
+        return "logs_dir" if name.lower() == "logs" else "other_dir"
+    if name.endswith(".json"):
+        return "json"
+    if name.endswith(".vscdb"):
+        return "vscdb"
+    return "other_file"
+
+
+def _is_real_dir(entry: os.DirEntry) -> bool:
+    """True for a directory to recurse into; symlinks and Windows junctions are not."""
+    if not entry.is_dir(follow_symlinks=False):
+        return False
+    if os.name == 'nt':
+        # Junctions report as directories; the lstat data is cached on Windows
+        attributes = getattr(entry.stat(follow_symlinks=False), 'st_file_attributes', 0)
+        return not attributes & FILE_ATTRIBUTE_REPARSE_POINT
+    return True
+
+
+def _rmtree_fast(path: str) -> None:
+    """Delete a directory tree, taking entry types from scandir instead of stat."""
+    with os.scandir(path) as it:
+        for entry in it:
+            if _is_real_dir(entry):
+                _rmtree_fast(entry.path)
+            else:
+                # Also removes links to directories without touching the target
+                os.unlink(entry.path)
+    os.rmdir(path)
+
+
+def _clear_dir_contents(path: str, errors_out: List[str]) -> None:
+    """Delete everything inside a directory, recording per-entry failures in errors_out."""
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                if _is_real_dir(entry):
+                    _rmtree_fast(entry.path)
+                else:
+                    os.unlink(entry.path)
+            except OSError as e:
+                errors_out.append(f"Could not clear {entry.path}: {e}")
+
+
+def _truncate_to_empty_json(path: str) -> None:
+    """Replace a JSON file's content with an empty object."""
+    fd = os.open(path, os.O_WRONLY | os.O_TRUNC)
+    try:
+        os.write(fd, b"{}")
+    finally:
+        os.close(fd)
+
+
+def find_session_files(editor_type: str) -> List[SessionFileInfo]:
     """
     Find session-related files that might need special handling.
     
+    Results are cached for SESSION_CACHE_TTL seconds; each call gets its own
+    copies of the entries.
+    
     Args:
         editor_type: The editor type (e.g., "Code", "VSCodium", "Code - Insiders")
         
     Returns:
         List of session file information
     """
+    cached = _session_cache.get(editor_type)
+    if cached is not None and time.monotonic() - cached[0] < SESSION_CACHE_TTL:
+        return [file_info.copy() for file_info in cached[1]]
+    
+    session_files = _scan_session_files(editor_type)
+    _session_cache[editor_type] = (time.monotonic(), session_files)
+    return [file_info.copy() for file_info in session_files]
+
+
+def _scan_session_files(editor_type: str) -> List[SessionFileInfo]:
+    """Scan the filesystem for find_session_files()."""
     session_files = []
     
     try:
@@ -29,35 +167,45 @@ def find_session_files(editor_type: str) -> List[Dict[str, Any]]:
             appdata = os.getenv("APPDATA", "")
             editor_path = os.path.join(appdata, editor_type)
             
-            # Common session-related paths
-            session_paths = [
-                os.path.join(editor_path, "User", "globalStorage", "storage.json"),
-                os.path.join(editor_path, "User", "globalStorage", "state.vscdb"),
-                os.path.join(editor_path, "User", "workspaceStorage"),
-                os.path.join(editor_path, "logs"),
-                os.path.join(editor_path, "CachedExtensions"),
-                os.path.join(editor_path, "CachedExtensionVSIXs"),
-                os.path.join(editor_path, "User", "History"),
-            ]
-            
-            for path in session_paths:
-                if os.path.exists(path):
+            # One directory listing per parent; the DirEntry objects carry the
+            # type and (on Windows) the stat data, so no per-path probes remain
+            listings = {}
+            for parent_parts, name in SESSION_ENTRIES:
+                parent = os.path.join(editor_path, *parent_parts)
+                if parent not in listings:
                     try:
-                        stat_info = os.stat(path)
-                        session_files.append({
-                            'path': path,
-                            'type': 'directory' if os.path.isdir(path) else 'file',
-                            'size': stat_info.st_size if os.path.isfile(path) else None,
-                            'modified': stat_info.st_mtime,
-                            'accessible': os.access(path, os.R_OK | os.W_OK)
-                        })
+                        with os.scandir(parent) as it:
+                            # Keyed like paths.fold_name() so case is ignored
+                            # where the file system ignores it
+                            listings[parent] = {fold_name(entry.name): entry for entry in it}
+                    except OSError:
+                        listings[parent] = {}
+                
+                entry = listings[parent].get(fold_name(name))
+                if entry is not None:
+                    path = entry.path
+                    try:
+                        # One lstat-style result gives type, size and mtime;
+                        # on Windows it comes straight from the directory listing
+                        stat_info = entry.stat(follow_symlinks=False)
+                        is_dir = stat.S_ISDIR(stat_info.st_mode)
+                        # Symlinks and Windows junctions are reported but left alone
+                        is_link = (stat.S_ISLNK(stat_info.st_mode) or bool(
+                            getattr(stat_info, 'st_file_attributes', 0) & FILE_ATTRIBUTE_REPARSE_POINT))
+                        session_files.append(SessionFileInfo(
+                            path,
+                            'symlink' if is_link else 'directory' if is_dir else 'file',
+                            _classify_session_entry(name, is_dir, is_link),
+                            size=None if is_dir else stat_info.st_size,
+                            modified=stat_info.st_mtime,
+                            # Same rule as os.access(R_OK | W_OK) on Windows:
+                            # only the read-only attribute of a file matters
+                            accessible=is_dir or bool(stat_info.st_mode & stat.S_IWRITE)
+                        ))
                     except Exception as e:
-                        session_files.append({
-                            'path': path,
-                            'type': 'unknown',
-                            'error': str(e),
-                            'accessible': False
-                        })
+                        session_files.append(SessionFileInfo(
+                            path, 'unknown', 'unknown', error=str(e)
+                        ))
     
     except Exception as e:
         print(f"Error finding session files: {e}")
@@ -86,42 +234,27 @@ def clear_session_data(editor_type: str) -> Dict[str, Any]:
         session_files = find_session_files(editor_type)
         
         for file_info in session_files:
-            path = file_info['path']
+            path = file_info.path
             
-            # Skip workspace storage - that's handled separately
-            if 'workspaceStorage' in path:
-                continue
-                
             try:
-                if file_info['type'] == 'file':
-                    # For files, try to clear content or delete
-                    if path.endswith('.json'):
+                match file_info.kind:
+                    case 'json':
                         # Clear JSON files by writing empty object
-                        with open(path, 'w') as f:
-                            json.dump({}, f)
+                        _truncate_to_empty_json(path)
                         result['cleared_files'].append(f"Cleared: {path}")
-                    elif path.endswith('.vscdb'):
+                    case 'vscdb':
                         # For database files, just note them (handled by database cleaner)
                         result['cleared_files'].append(f"Database file noted: {path}")
-                    else:
+                    case 'other_file':
                         # For other files, try to delete
                         os.remove(path)
                         result['cleared_files'].append(f"Deleted: {path}")
-                        
-                elif file_info['type'] == 'directory':
-                    # For directories like logs, clear contents but keep directory
-                    if 'logs' in path.lower():
-                        for item in os.listdir(path):
-                            item_path = os.path.join(path, item)
-                            try:
-                                if os.path.isfile(item_path):
-                                    os.remove(item_path)
-                                elif os.path.isdir(item_path):
-                                    import shutil
-                                    shutil.rmtree(item_path)
-                            except Exception as e:
-                                result['errors'].append(f"Could not clear {item_path}: {e}")
+                    case 'logs_dir':
+                        # For directories like logs, clear contents but keep directory
+                        _clear_dir_contents(path, result['errors'])
                         result['cleared_files'].append(f"Cleared directory: {path}")
+                    # workspace_skip is handled separately; other_dir and
+                    # unknown entries are left alone
                         
             except Exception as e:
                 result['errors'].append(f"Could not clear {path}: {e}")
@@ -129,6 +262,9 @@ def clear_session_data(editor_type: str) -> Dict[str, Any]:
     except Exception as e:
         result['success'] = False
         result['errors'].append(f"Session clearing failed: {e}")
+    finally:
+        # The files were just modified; the next status check must rescan
+        _session_cache.pop(editor_type, None)
     
     if result['errors']:
         result['success'] = len(result['errors']) < len(result['cleared_files'])
@@ -150,7 +286,7 @@ def get_session_status(editor_type: str) -> Dict[str, Any]:
         session_files = find_session_files(editor_type)
         
         total_files = len(session_files)
-        accessible_files = sum(1 for f in session_files if f.get('accessible', False))
+        accessible_files = sum(1 for f in session_files if f.accessible)
         locked_files = total_files - accessible_files
         
         return {
@@ -159,7 +295,8 @@ def get_session_status(editor_type: str) -> Dict[str, Any]:
             'total_session_files': total_files,
             'accessible_files': accessible_files,
             'locked_files': locked_files,
-            'session_files': session_files,
+            # Plain dicts for the JavaScript side
+            'session_files': [f.to_dict() for f in session_files],
             'has_active_session': locked_files > 0
         }
         
@@ -7,10 +7,58 @@ allowing users to switch between Chinese and English languages.
 
 import json
 import os
+import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
 
 
+def _flatten(data: Dict[str, Any], prefix: str = "", out: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Map every dotted key path in a nested catalog to its value.
+
+    Intermediate dicts are included as well as leaves, so a lookup returns
+    exactly what walking the nested dicts one key at a time would.
+    """
+    if out is None:
+        out = {}
+    for key, value in data.items():
+        path = prefix + key
+        out[path] = value
+        if isinstance(value, dict):
+            _flatten(value, path + ".", out)
+    return out
+
+
+_EMPTY: Dict[str, Any] = {}
+_MISSING = object()
+
+
+def _has_t_prefix(data: Dict[str, Any]) -> bool:
+    """
+    Check whether translate_dict would translate anything in a dict.
+
+    Mirrors translate_dict's traversal: nested dict values and dicts inside
+    lists are searched, other list items are left alone.
+    """
+    stack = [data]
+    while stack:
+        for value in stack.pop().values():
+            value_type = type(value)
+            if value_type is str:
+                if value[:2] == "t:":
+                    return True
+            elif value_type is dict:
+                stack.append(value)
+            elif value_type is list:
+                stack.extend(item for item in value if type(item) is dict)
+    return False
+
+
+# language.json only ever holds {"language": "<code>"}
+_LANGUAGE_RE = re.compile(rb'"language"\s*:\s*"([^"]+)"')
+
+
 class TranslationManager:
     """
     Manages translations and language switching for the application.
@@ -19,14 +67,24 @@ class TranslationManager:
     def __init__(self):
         """Initialize the translation manager."""
         self.current_language = "zh_CN"  # Default to Chinese
+        # Parsed catalogs, filled on first use by _ensure_loaded
         self.translations: Dict[str, Dict[str, Any]] = {}
+        # Language code -> catalog file, discovered without reading the files
+        self._translation_paths: Dict[str, Path] = {}
+        # Dotted key -> value for each language, built from self.translations
+        self._flat: Dict[str, Dict[str, Any]] = {}
+        # Memoized (lang_code, key) -> text; bound per instance so each
+        # manager caches against its own catalog
+        self._cached_lookup = lru_cache(maxsize=2048)(self._lookup)
         self.translations_dir = self._get_translations_dir()
         self.config_file = self._get_config_file()
+        # Language currently stored in config_file, None if nothing saved yet
+        self._persisted_language: Optional[str] = None
         
         # Load saved language preference
         self._load_language_preference()
         
-        # Load all available translations
+        # Discover translation files; only the current language is parsed now
         self._load_translations()
 
     def _get_translations_dir(self) -> Path:
@@ -46,10 +104,9 @@ class TranslationManager:
         """Get the language config file path."""
         try:
             # Use user's home directory for config
+            # The directory is created on first save, not here
             home_dir = Path.home()
-            config_dir = home_dir / ".augment_free"
-            config_dir.mkdir(exist_ok=True)
-            return config_dir / "language.json"
+            return home_dir / ".augment_free" / "language.json"
         except Exception:
             # Fallback to current directory
             return Path(".") / "language.json"
@@ -58,25 +115,33 @@ class TranslationManager:
         """Load the saved language preference."""
         try:
             if self.config_file.exists():
-                with open(self.config_file, "r", encoding="utf-8") as f:
-                    config = json.load(f)
-                    self.current_language = config.get("language", "zh_CN")
+                # A regex is enough for this one-key file; no JSON decode
+                match = _LANGUAGE_RE.search(self.config_file.read_bytes())
+                self._persisted_language = match.group(1).decode("utf-8") if match else None
+                self.current_language = self._persisted_language or "zh_CN"
         except Exception:
             # Use default language if loading fails
             self.current_language = "zh_CN"
 
     def _save_language_preference(self) -> None:
         """Save the current language preference."""
+        if self.current_language == self._persisted_language:
+            return
         try:
             config = {"language": self.current_language}
-            with open(self.config_file, "w", encoding="utf-8") as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
+            # Write beside the target and rename over it so a crash never
+            # leaves a truncated file behind
+            self.config_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.config_file.with_suffix(".json.tmp")
+            tmp_file.write_bytes(json.dumps(config, ensure_ascii=False, indent=2).encode("utf-8"))
+            os.replace(tmp_file, self.config_file)
+            self._persisted_language = self.current_language
         except Exception:
             # Silently fail if saving is not possible
             pass
 
     def _load_translations(self) -> None:
-        """Load all available translation files."""
+        """Discover translation files and load the current language."""
         import sys
 
         if not self.translations_dir.exists():
@@ -86,19 +151,35 @@ class TranslationManager:
             return
 
         for file_path in self.translations_dir.glob("*.json"):
-            try:
-                lang_code = file_path.stem
-                with open(file_path, "r", encoding="utf-8") as f:
-                    self.translations[lang_code] = json.load(f)
-            except Exception as e:
-                print(f"Warning: Failed to load translation file {file_path}: {e}")
+            self._translation_paths[file_path.stem] = file_path
+
+        self._ensure_loaded(self.current_language)
 
         # Show loaded translations count
         if self.translations:
-            print(f"Loaded {len(self.translations)} translation(s): {list(self.translations.keys())}")
+            print(f"Loaded {len(self.translations)} translation(s): {list(self.translations.keys())} "
+                  f"(available: {list(self._translation_paths.keys())})")
         else:
             print("Warning: No translations loaded")
 
+    def _ensure_loaded(self, lang_code: str) -> None:
+        """Parse a language's translation file the first time it is needed."""
+        if lang_code in self.translations:
+            return
+        file_path = self._translation_paths.get(lang_code)
+        if file_path is None:
+            return
+        try:
+            with open(file_path, "rb") as f:
+                translations = json.loads(f.read())
+        except Exception as e:
+            print(f"Warning: Failed to load translation file {file_path}: {e}")
+            # Don't retry a broken file on every lookup
+            del self._translation_paths[lang_code]
+            return
+        self.translations[lang_code] = translations
+        self._flat[lang_code] = _flatten(translations)
+
     def get_available_languages(self) -> Dict[str, str]:
         """
         Get available languages.
@@ -135,6 +216,7 @@ class TranslationManager:
             return False
             
         self.current_language = lang_code
+        self._cached_lookup.cache_clear()
         self._save_language_preference()
         return True
 
@@ -151,20 +233,17 @@ class TranslationManager:
         """
         if lang_code is None:
             lang_code = self.current_language
-            
-        if lang_code not in self.translations:
-            return key
-            
-        # Support dot notation for nested keys
-        translation_data = self.translations[lang_code]
-        keys = key.split(".")
-        
-        try:
-            for k in keys:
-                translation_data = translation_data[k]
-            return str(translation_data)
-        except (KeyError, TypeError):
+        return self._cached_lookup(lang_code, key)
+
+    def _lookup(self, lang_code: str, key: str) -> str:
+        """Resolve a key against the flattened catalog (uncached)."""
+        # Loading first means a miss is never cached for an unloaded language
+        self._ensure_loaded(lang_code)
+        # Dot notation is resolved by a single lookup in the flattened catalog
+        translation_data = self._flat.get(lang_code, _EMPTY).get(key, _MISSING)
+        if translation_data is _MISSING:
             return key
+        return str(translation_data)
 
     def get_all_translations(self, lang_code: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -178,7 +257,8 @@ class TranslationManager:
         """
         if lang_code is None:
             lang_code = self.current_language
-            
+
+        self._ensure_loaded(lang_code)
         return self.translations.get(lang_code, {})
 
     def translate_dict(self, data: Dict[str, Any], lang_code: Optional[str] = None) -> Dict[str, Any]:
@@ -192,30 +272,45 @@ class TranslationManager:
         Returns:
             dict: Dictionary with translated values
         """
-        if not isinstance(data, dict):
+        if not isinstance(data, dict) or not _has_t_prefix(data):
             return data
-            
+
+        # Walk with an explicit stack of (source, result) dict pairs instead
+        # of recursing; results are attached to their parent before filling
         result = {}
-        for key, value in data.items():
-            if isinstance(value, str) and value.startswith("t:"):
-                # Translation key format: "t:ui.header.title"
-                translation_key = value[2:]  # Remove "t:" prefix
-                result[key] = self.get_translation(translation_key, lang_code)
-            elif isinstance(value, dict):
-                result[key] = self.translate_dict(value, lang_code)
-            elif isinstance(value, list):
-                result[key] = [
-                    self.translate_dict(item, lang_code) if isinstance(item, dict) else item
-                    for item in value
-                ]
-            else:
-                result[key] = value
-                
+        stack = [(data, result)]
+        while stack:
+            source, target = stack.pop()
+            for key, value in source.items():
+                # Exact type checks: the UI payloads are plain JSON-style data
+                value_type = type(value)
+                if value_type is str and value[:2] == "t:":
+                    # Translation key format: "t:ui.header.title"
+                    translation_key = value[2:]  # Remove "t:" prefix
+                    target[key] = self.get_translation(translation_key, lang_code)
+                elif value_type is dict:
+                    target[key] = child = {}
+                    stack.append((value, child))
+                elif value_type is list:
+                    items = []
+                    for item in value:
+                        if type(item) is dict:
+                            child = {}
+                            stack.append((item, child))
+                            items.append(child)
+                        else:
+                            items.append(item)
+                    target[key] = items
+                else:
+                    target[key] = value
+
         return result
 
 
-# Global translation manager instance
-_translation_manager = None
+# Global translation manager instance, built once at import time; the
+# import lock already serializes this, so concurrent callers can never
+# construct a second manager
+_translation_manager = TranslationManager()
 
 
 def get_translation_manager() -> TranslationManager:
@@ -225,9 +320,6 @@ def get_translation_manager() -> TranslationManager:
     Returns:
         TranslationManager: Global translation manager
     """
-    global _translation_manager
-    if _translation_manager is None:
-        _translation_manager = TranslationManager()
     return _translation_manager
 
 